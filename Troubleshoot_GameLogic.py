@@ -1,4 +1,8 @@
 # Game Logic
+import random
+
+from Troubleshoot_Init import GAME_WIDTH, GAME_HEIGHT, GRID_SIZE
+
 def spawn_food(snake):
     """Spawn food in a random location, avoiding the snake"""
     while True:
@@ -15,4 +19,5 @@ def move_snake(snake, dx, dy):
     return new_head
 
 # This module should be tested with different snake movements and food spawns
-print("Game Logic Module loaded successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    print("Game Logic Module loaded successfully.")
@@ -1,5 +1,11 @@
 # High Score Management
 import os
+import sys
+
+import pygame
+
+import Troubleshoot_Init as setup
+from Troubleshoot_Init import WIDTH, HEIGHT, BLACK, WHITE
 
 def save_high_score(score):
     """Save the high score to a text file"""
@@ -29,6 +35,7 @@ def show_high_scores():
         with open(file_path, "r") as f:
             high_scores = [line.strip() for line in f]
 
+    screen = setup.screen
     screen.fill(BLACK)
     font = pygame.font.Font(None, 36)
     title = font.render("High Scores", True, WHITE)
@@ -56,4 +63,5 @@ def show_high_scores():
                     return False
 
 # This module should be tested by calling `save_high_score(score)` and `show_high_scores()`
-print("High Score Management Module loaded successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    print("High Score Management Module loaded successfully.")
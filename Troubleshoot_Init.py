@@ -3,17 +3,13 @@ import pygame
 import sys
 import random
 
-pygame.init()
-
 # Set up the display
 WIDTH, HEIGHT = 1000, 700
 GAME_WIDTH, GAME_HEIGHT = 800, 600
 GRID_SIZE = 20
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Snake Game v1.0")
-
-# Set up the clock for controlling game speed
-clock = pygame.time.Clock()
+# Window and clock, created by init() so importing this module opens nothing
+screen = None
+clock = None
 
 # Define colors
 BLACK = (0, 0, 0)
@@ -22,5 +18,18 @@ RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 GRAY = (100, 100, 100)
 
+def init():
+    """Open the window, only the display and font modules are started"""
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Snake Game v1.0")
+
+    # Set up the clock for controlling game speed
+    clock = pygame.time.Clock()
+
 # This module should initialize without errors
-print("Initialization & Setup Module loaded successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    init()
+    print("Initialization & Setup Module loaded successfully.")
@@ -1,6 +1,17 @@
 # Main Game Loop
+import sys
+
+import pygame
+
+import Troubleshoot_Init as setup
+from Troubleshoot_Init import GAME_WIDTH, GAME_HEIGHT, GRID_SIZE, BLACK, RED, GREEN
+from Troubleshoot_Drawing import draw_grid
+from Troubleshoot_GameLogic import spawn_food, move_snake
+
 def main():
     """Main game loop"""
+    setup.init()
+    screen = setup.screen
     snake = [[GAME_WIDTH // 2, GAME_HEIGHT // 2]]
     dx, dy = GRID_SIZE, 0
     food = spawn_food(snake)
@@ -36,9 +47,10 @@ def main():
         for segment in snake:
             pygame.draw.rect(screen, GREEN, (segment[0], segment[1], GRID_SIZE, GRID_SIZE))
         pygame.display.flip()
-        clock.tick(10)
+        setup.clock.tick(10)
 
     pygame.quit()
     sys.exit()
 
-print("Main Game Loop Module loaded successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    print("Main Game Loop Module loaded successfully.")
@@ -3,18 +3,22 @@ import sys
 import random
 import json
 
-# Initialize Pygame
-pygame.init()
-
 # Set up the display
 WIDTH, HEIGHT = 1000, 700
 GAME_WIDTH, GAME_HEIGHT = 800, 600
 GRID_SIZE = 20
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Advanced Snake Game")
-
-# Set up the clock for controlling game speed
-clock = pygame.time.Clock()
+# Window and clock, created by init() so importing this file opens nothing
+screen = None
+clock = None
+
+def init():
+    """Open the window, only the display and font modules are started"""
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Advanced Snake Game")
+    clock = pygame.time.Clock()
 
 # Define colors
 BLACK = (0, 0, 0)
@@ -311,5 +315,6 @@ def main():
         clock.tick(speed)
 
 if __name__ == "__main__":
+    init()
     while True:
         main()
\ No newline at end of file
@@ -4,15 +4,23 @@ import random
 import os
 
 # Initialization & Setup
-pygame.init()
 WIDTH, HEIGHT = 1000, 700
 GAME_WIDTH, GAME_HEIGHT = 800, 600
 GRID_SIZE = 20
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Snake Game v1.1")
-clock = pygame.time.Clock()
+# Window and clock, created by init() so importing this file opens nothing
+screen = None
+clock = None
 BLACK, WHITE, RED, GREEN, GRAY = (0, 0, 0), (255, 255, 255), (255, 0, 0), (0, 255, 0), (100, 100, 100)
 
+# Open the window, only the display and font modules are started
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Snake Game v1.1")
+    clock = pygame.time.Clock()
+
 # High Score Management
 def save_high_score(score):
     file_path = os.path.join(os.getcwd(), "high_scores.txt")
@@ -154,4 +162,5 @@ def main():
     sys.exit()
 
 if __name__ == "__main__":
+    init()
     main()
\ No newline at end of file
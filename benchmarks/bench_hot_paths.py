@@ -0,0 +1,244 @@
+"""Benchmarks for the simulation and rendering hot paths.
+
+Runs under SDL's dummy video driver, so no window opens. Every benchmark is
+measured across a matrix of snake lengths, board sizes and obstacle counts
+and the results are written as JSON, which --compare can diff against an
+earlier run:
+
+    python benchmarks/bench_hot_paths.py --output before.json
+    python benchmarks/bench_hot_paths.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from ular_yang_mengular.game import SnakeGame
+from ular_yang_mengular.snake_engine import Config, SnakeEngine, DOWN
+from ular_yang_mengular.snake_render import AtlasRenderer, DirtyRectRenderer, RasterRenderer
+
+# Renderer class per Config.RENDER_MODE, the full redraw has none
+RENDERERS = {
+    "full": None,
+    "dirty": DirtyRectRenderer,
+    "atlas": AtlasRenderer,
+    "raster": RasterRenderer,
+}
+
+# Board sizes in cells. The pixel area stays 1100x800, bigger boards get smaller cells.
+BOARDS = [(44, 32), (88, 64), (176, 128)]
+SNAKE_LENGTHS = [1, 10, 100, 1000, 4000]
+OBSTACLE_COUNTS = [0, 10, 100, 1000]
+
+def make_config(cols, rows, obstacles):
+    config = Config()
+    config.GRID_SIZE = min(config.GAME_WIDTH // cols, config.GAME_HEIGHT // rows)
+    config.GAME_WIDTH = cols * config.GRID_SIZE
+    config.GAME_HEIGHT = rows * config.GRID_SIZE
+    config.OBSTACLE_COUNT = obstacles
+    config.POWERUP_CHANCE = 0
+    return config
+
+def fits(cols, rows, length, obstacles):
+    # Leave the snake free rows to move into and room for food and obstacles
+    return length <= cols * (rows - 2) and length + obstacles + 2 < cols * rows
+
+def build_engine(config, length, seed=0):
+    # Lay the snake out in a serpentine over the top rows with the head
+    # pointing down into empty space, then drop obstacles and food around it
+    obstacles = config.OBSTACLE_COUNT
+    config.OBSTACLE_COUNT = 0
+    engine = SnakeEngine(config, "Medium", seed)
+    config.OBSTACLE_COUNT = obstacles
+
+    while engine.snake:
+        engine.remove_tail()
+    for i in range(length):
+        row, col = divmod(i, engine.cols)
+        if row % 2:
+            col = engine.cols - 1 - col
+        engine.add_head((col, row))
+    engine.direction = DOWN
+
+    engine.free.add(engine.food)
+    engine.food = None
+    engine.obstacles = engine.spawn_obstacles(obstacles)
+    engine.food = engine.spawn_food()
+    return engine
+
+def measure(setup, func, samples, prepare=None):
+    # Times func(state) one call at a time. prepare(state) runs untimed before
+    # each call, and setup() builds a fresh state whenever func returns False.
+    times = []
+    state = setup()
+    while len(times) < samples:
+        if prepare:
+            prepare(state)
+        start = time.perf_counter_ns()
+        ok = func(state)
+        times.append(time.perf_counter_ns() - start)
+        if ok is False:
+            state = setup()
+    times.sort()
+    return {
+        "samples": len(times),
+        "mean_us": statistics.fmean(times) / 1000,
+        "median_us": times[len(times) // 2] / 1000,
+        "p95_us": times[int(len(times) * 0.95)] / 1000,
+        "min_us": times[0] / 1000,
+    }
+
+def bench_engine(cols, rows, length, obstacles, samples):
+    config = make_config(cols, rows, obstacles)
+    setup = lambda: build_engine(config, length)
+    results = {}
+
+    def step(engine):
+        engine.step()
+        return not engine.done
+    results["engine_step"] = measure(setup, step, samples)
+
+    results["check_collision"] = measure(setup, lambda engine: engine.check_collision(), samples)
+
+    def spawn_food(engine):
+        cell = engine.spawn_food()
+        engine.free.add(cell)
+    results["spawn_food"] = measure(setup, spawn_food, samples)
+
+    def spawn_obstacles(engine):
+        for cell in engine.spawn_obstacles(obstacles or 10):
+            engine.free.add(cell)
+    results["spawn_obstacles"] = measure(setup, spawn_obstacles, samples)
+    return results
+
+def bench_render(game, cols, rows, length, obstacles, samples, mode):
+    config = make_config(cols, rows, obstacles)
+    game.config = config
+    renderer = RENDERERS[mode]
+    game.renderer = renderer(game) if renderer else None
+    game.alpha = 1.0
+
+    def setup():
+        game.engine = build_engine(config, length)
+        if game.renderer:
+            game.renderer.invalidate()
+            game.draw_game()
+        return game
+
+    def step(game):
+        # Untimed, so the dirty renderer sees a normal tick's worth of change
+        game.engine.step()
+
+    def draw(game):
+        game.draw_game()
+        return not game.engine.done
+
+    return {
+        "draw_game": measure(setup, draw, samples, prepare=step),
+        "draw_side_panel": measure(setup, lambda game: game.draw_side_panel(), samples),
+    }
+
+def run(args):
+    lengths = [int(x) for x in args.lengths.split(",")]
+    boards = [tuple(int(v) for v in b.split("x")) for b in args.boards.split(",")]
+    obstacle_counts = [int(x) for x in args.obstacles.split(",")]
+
+    # SnakeGame keeps its score database in the working directory
+    workdir = tempfile.TemporaryDirectory()
+    os.chdir(workdir.name)
+    game = SnakeGame()
+
+    results = []
+    for cols, rows in boards:
+        for obstacles in obstacle_counts:
+            for length in lengths:
+                if not fits(cols, rows, length, obstacles):
+                    continue
+                case = {"board": [cols, rows], "snake_length": length, "obstacles": obstacles}
+                timings = bench_engine(cols, rows, length, obstacles, args.samples)
+                if not args.skip_render:
+                    for mode in RENDERERS:
+                        for name, timing in bench_render(game, cols, rows, length, obstacles,
+                                                         args.render_samples, mode).items():
+                            timings[f"{name}[{mode}]"] = timing
+                for name, timing in timings.items():
+                    results.append(dict(case, name=name, **timing))
+                print(f"board {cols}x{rows} obstacles {obstacles} length {length}: "
+                      + ", ".join(f"{name} {t['median_us']:.1f}us" for name, t in timings.items()),
+                      file=sys.stderr)
+    game.score_writer.close()
+    workdir.cleanup()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+
+# Names earlier runs used for a case, so --compare still pairs them up
+RENAMED = {"update_game": "engine_step"}
+
+def result_key(result):
+    return (RENAMED.get(result["name"], result["name"]), tuple(result["board"]), result["snake_length"], result["obstacles"])
+
+def compare(baseline, current):
+    # Ratio of median times, above 1 means the current run is faster
+    before = {result_key(r): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get(result_key(result))
+        if old and result["median_us"]:
+            rows.append((result_key(result), old["median_us"], result["median_us"],
+                         old["median_us"] / result["median_us"]))
+    for (name, board, length, obstacles), old, new, speedup in rows:
+        print(f"{name:24} {board[0]:>4}x{board[1]:<4} len {length:>5} obs {obstacles:>5}  "
+              f"{old:10.1f}us -> {new:10.1f}us  x{speedup:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulation and rendering hot paths")
+    parser.add_argument("--lengths", default=",".join(map(str, SNAKE_LENGTHS)), help="snake lengths, comma separated")
+    parser.add_argument("--boards", default=",".join(f"{c}x{r}" for c, r in BOARDS), help="board sizes in cells, e.g. 44x32,88x64")
+    parser.add_argument("--obstacles", default=",".join(map(str, OBSTACLE_COUNTS)), help="obstacle counts, comma separated")
+    parser.add_argument("--samples", type=int, default=2000, help="timed calls per engine benchmark")
+    parser.add_argument("--render-samples", type=int, default=100, help="timed calls per render benchmark")
+    parser.add_argument("--skip-render", action="store_true", help="only benchmark the engine")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="print speedups against an earlier JSON run")
+    args = parser.parse_args()
+
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    if args.compare:
+        args.compare = os.path.abspath(args.compare)
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
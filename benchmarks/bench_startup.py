@@ -0,0 +1,138 @@
+"""Cold-start benchmark: how long until each kind of process is ready.
+
+Every case runs in a fresh interpreter, started as many times as --samples
+asks, and is timed from just before the process is spawned until it reports
+it is ready, so interpreter start, imports and SDL set-up all count but
+shutdown does not. Runs under SDL's dummy video driver, so no window opens.
+Results are written as JSON, which --compare can diff against an earlier run:
+
+    python benchmarks/bench_startup.py --output before.json
+    python benchmarks/bench_startup.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each kind of process does before it is ready
+CASES = {
+    # Baseline: the interpreter alone
+    "interpreter": "",
+    "import_package": "import ular_yang_mengular",
+    # A headless agent worker: one environment, reset and stepped once
+    "headless_env": (
+        "from ular_yang_mengular.snake_env import SnakeEnv\n"
+        "env = SnakeEnv(seed=1)\n"
+        "env.reset()\n"
+        "env.step(None)"
+    ),
+    "cli_levels": (
+        "from ular_yang_mengular.cli import main\n"
+        "main(['--levels'])"
+    ),
+    # What the old front ends did at import time, against what the game does now
+    "pygame_init_all": "import pygame\npygame.init()",
+    "pygame_display_font": "import pygame\npygame.display.init()\npygame.font.init()",
+    # The window open and the menu drawn
+    "game_first_frame": (
+        "from ular_yang_mengular.game import SnakeGame\n"
+        "game = SnakeGame()\n"
+        "game.draw_menu()"
+    ),
+}
+
+# Printed by the child once it is ready. time.monotonic() is one clock for
+# every process on the machine, so the parent can subtract its own reading.
+READY = "\nimport sys as _sys, time as _time\nprint('READY', _time.monotonic(), 'pygame' in _sys.modules)\n"
+
+def run_case(code, workdir, env):
+    # Seconds from spawn to ready, and whether the process imported pygame
+    start = time.monotonic()
+    result = subprocess.run([sys.executable, "-c", code + READY], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True)
+    ready = [line.split() for line in result.stdout.splitlines() if line.startswith("READY ")][-1]
+    return float(ready[1]) - start, ready[2] == "True"
+
+def measure(code, samples, workdir, env):
+    times = []
+    imports_pygame = False
+    for _ in range(samples):
+        elapsed, imports_pygame = run_case(code, workdir, env)
+        times.append(elapsed * 1000)
+    times.sort()
+    return {
+        "samples": len(times),
+        "mean_ms": statistics.fmean(times),
+        "median_ms": times[len(times) // 2],
+        "p95_ms": times[int(len(times) * 0.95)],
+        "min_ms": times[0],
+        "imports_pygame": imports_pygame,
+    }
+
+def run(args):
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    # The game keeps its score database in the working directory
+    workdir = tempfile.TemporaryDirectory()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    results = []
+    for name in names:
+        # One untimed run first, so every sample finds the files in the page cache
+        run_case(CASES[name], workdir.name, env)
+        timing = measure(CASES[name], args.samples, workdir.name, env)
+        results.append(dict(name=name, **timing))
+        print(f"{name}: {timing['median_ms']:.1f}ms" + (" (pygame)" if timing["imports_pygame"] else ""),
+              file=sys.stderr)
+    workdir.cleanup()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+
+def compare(baseline, current):
+    # Ratio of median times, above 1 means the current run starts faster
+    before = {r["name"]: r for r in baseline["results"]}
+    for result in current["results"]:
+        old = before.get(result["name"])
+        if old and result["median_ms"]:
+            print(f"{result['name']:24} {old['median_ms']:8.1f}ms -> {result['median_ms']:8.1f}ms  "
+                  f"x{old['median_ms'] / result['median_ms']:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start time of the game and headless workers")
+    parser.add_argument("--cases", help="cases to run, comma separated: " + ",".join(CASES))
+    parser.add_argument("--samples", type=int, default=20, help="process starts per case")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="print speedups against an earlier JSON run")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# Ular yang Mengular, a snake game with a headless engine and a pygame front end.
+#
+# Importing the package or any of the simulation modules (snake_engine,
+# snake_env, snake_arena, replay, levels, ...) never imports pygame, so
+# agents, tools and worker processes start without opening a window or
+# initialising SDL. Only game, snake_render and frame_capture need pygame.
+
+__version__ = "1.3.0"
@@ -0,0 +1,189 @@
+import numpy as np
+
+from .snake_engine import Config
+from .snake_env import EMPTY, BODY, HEAD, FOOD, OBSTACLE, DEATH_REWARD
+
+# Lockstep snake rules for K games at once, held entirely in NumPy arrays.
+# Each step() advances every game by one tick with a fixed number of array
+# operations, so the cost per tick shrinks as K grows.
+#
+# The rules follow SnakeEngine: the snake grows by one per food, the tail
+# leaves its cell before the collision check, and hitting a wall, an obstacle
+# or the body ends the game. Power-ups are not simulated, and games are
+# seeded from one NumPy generator, so a batch game will not replay in
+# SnakeEngine with the same seed.
+
+# Direction indexes match snake_engine.DIRECTIONS: up, down, left, right
+DX = np.array([0, 0, -1, 1], dtype=np.int32)
+DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+
+# death_cause codes
+ALIVE = 0
+WALL = 1
+SELF = 2
+OBSTACLE_HIT = 3
+DEATH_CAUSES = (None, "wall", "self", "obstacle")
+
+# Rejection sampling rounds before a spawn falls back to listing the free cells
+SPAWN_TRIES = 8
+
+class BatchSnakeEngine:
+    """K snake games advanced together by vectorized steps"""
+
+    def __init__(self, k, config=None, seed=None):
+        self.config = config or Config()
+        self.k = k
+        self.cols = self.config.GAME_WIDTH // self.config.GRID_SIZE
+        self.rows = self.config.GAME_HEIGHT // self.config.GRID_SIZE
+        self.cells = self.cols * self.rows
+        self.rng = np.random.default_rng(seed)
+        self.games = np.arange(k)
+
+        # One occupancy grid per game using snake_env's cell codes, so it
+        # doubles as the observation. Cells are numbered row * cols + col.
+        self.grid = np.zeros((k, self.cells), dtype=np.uint8)
+        # Body as a ring buffer per game: the head is at body[g, head_slot[g]]
+        # and the tail length[g] - 1 slots behind it
+        self.body = np.zeros((k, self.cells), dtype=np.int32)
+        self.head_slot = np.zeros(k, dtype=np.int32)
+        self.length = np.zeros(k, dtype=np.int32)
+        self.head_x = np.zeros(k, dtype=np.int32)
+        self.head_y = np.zeros(k, dtype=np.int32)
+        self.direction = np.zeros(k, dtype=np.int8)
+        self.food = np.zeros(k, dtype=np.int32)
+        self.obstacle_count = np.zeros(k, dtype=np.int32)
+        self.score = np.zeros(k, dtype=np.int32)
+        self.ticks = np.zeros(k, dtype=np.int32)
+        self.done = np.zeros(k, dtype=bool)
+        self.won = np.zeros(k, dtype=bool)
+        self.death_cause = np.zeros(k, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask=None):
+        # Start new games where mask is True, or everywhere without a mask
+        games = self.games if mask is None else np.flatnonzero(mask)
+        if not games.size:
+            return self.observations()
+
+        self.grid[games] = EMPTY
+        x = self.cols // 2
+        y = self.rows // 2
+        head = y * self.cols + x
+        self.grid[games, head] = HEAD
+        self.head_slot[games] = 0
+        self.body[games, 0] = head
+        self.length[games] = 1
+        self.head_x[games] = x
+        self.head_y[games] = y
+        self.direction[games] = 3
+        self.score[games] = 0
+        self.ticks[games] = 0
+        self.done[games] = False
+        self.won[games] = False
+        self.death_cause[games] = ALIVE
+
+        # Same order as SnakeEngine.reset: food first, then the obstacles
+        self.food[games] = self.spawn(games, FOOD)
+        self.obstacle_count[games] = 0
+        for _ in range(self.config.OBSTACLE_COUNT):
+            placed = games[self.spawn(games, OBSTACLE) >= 0]
+            self.obstacle_count[placed] += 1
+        return self.observations()
+
+    def spawn(self, games, code):
+        # Put code on a random empty cell of each game, returns the cells (-1 if full)
+        cells = np.full(games.size, -1, dtype=np.int32)
+        pending = np.arange(games.size)
+        for _ in range(SPAWN_TRIES):
+            if not pending.size:
+                break
+            picks = self.rng.integers(0, self.cells, pending.size, dtype=np.int32)
+            # Two pending slots never share a game, so the picks cannot clash
+            empty = self.grid[games[pending], picks] == EMPTY
+            cells[pending[empty]] = picks[empty]
+            pending = pending[~empty]
+        # Nearly full boards: pick from the empty cells directly
+        for i in pending:
+            free = np.flatnonzero(self.grid[games[i]] == EMPTY)
+            if free.size:
+                cells[i] = free[self.rng.integers(free.size)]
+        placed = cells >= 0
+        self.grid[games[placed], cells[placed]] = code
+        return cells
+
+    def step(self, actions=None):
+        # actions: direction index per game, -1 to keep going straight.
+        # Returns (rewards, done). Finished games stay frozen until reset().
+        active = ~self.done
+        if actions is not None:
+            actions = np.asarray(actions)
+            # Only sideways turns: up/down are 0/1, left/right are 2/3
+            turn = active & (actions >= 0) & ((actions >> 1) != (self.direction >> 1))
+            self.direction[turn] = actions[turn]
+
+        games = self.games[active]
+        rewards = np.zeros(self.k, dtype=np.float32)
+        self.ticks[games] += 1
+        direction = self.direction[games]
+        x = self.head_x[games] + DX[direction]
+        y = self.head_y[games] + DY[direction]
+
+        wall = (x < 0) | (x >= self.cols) | (y < 0) | (y >= self.rows)
+        self.end(games[wall], WALL, rewards)
+        games = games[~wall]
+        x = x[~wall]
+        y = y[~wall]
+        cell = y * self.cols + x
+
+        # The tail leaves its cell first unless the snake is growing
+        eat = cell == self.food[games]
+        movers = games[~eat]
+        tail_slot = (self.head_slot[movers] - self.length[movers] + 1) % self.cells
+        self.grid[movers, self.body[movers, tail_slot]] = EMPTY
+
+        target = self.grid[games, cell]
+        hit_self = (target == BODY) | (target == HEAD)
+        hit_obstacle = target == OBSTACLE
+        self.end(games[hit_self], SELF, rewards)
+        self.end(games[hit_obstacle], OBSTACLE_HIT, rewards)
+        alive = ~(hit_self | hit_obstacle)
+        games = games[alive]
+        cell = cell[alive]
+        eat = eat[alive]
+
+        # Old head becomes body, unless it was a lone head that just left as
+        # the tail, and the new head goes in front of it in the ring
+        body = games[eat | (self.length[games] > 1)]
+        self.grid[body, self.body[body, self.head_slot[body]]] = BODY
+        self.grid[games, cell] = HEAD
+        slot = (self.head_slot[games] + 1) % self.cells
+        self.head_slot[games] = slot
+        self.body[games, slot] = cell
+        self.head_x[games] = x[alive]
+        self.head_y[games] = y[alive]
+
+        eaters = games[eat]
+        self.length[eaters] += 1
+        self.score[eaters] += 1
+        rewards[eaters] += 1
+        food = self.spawn(eaters, FOOD)
+        self.food[eaters] = food
+        # Nowhere left to put food, the snake has filled the board
+        full = eaters[food < 0]
+        self.won[full] = True
+        self.done[full] = True
+        return rewards, self.done
+
+    def end(self, games, cause, rewards):
+        self.done[games] = True
+        self.death_cause[games] = cause
+        rewards[games] += DEATH_REWARD
+
+    def observations(self):
+        # (K, rows, cols) view of the occupancy grids, updated in place by step()
+        return self.grid.reshape(self.k, self.rows, self.cols)
+
+    def snake(self, game):
+        # Cells of one game's snake, head first, as (col, row) like SnakeEngine
+        slots = (self.head_slot[game] - np.arange(self.length[game])) % self.cells
+        return [(int(c) % self.cols, int(c) // self.cols) for c in self.body[game, slots]]
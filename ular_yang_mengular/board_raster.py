@@ -0,0 +1,108 @@
+import itertools
+
+import numpy as np
+
+from .palette import (GRADIENT_LENGTH, EMPTY, FOOD, OBSTACLE, OPPONENT_BODY, OPPONENT_HEAD, POWER_UP,
+                      palette)
+
+# The board as a cell grid for Ular yang Mengular.
+#
+# One byte per board cell holds a palette index: the shade of the snake
+# segment on it, food, a power-up, an obstacle, an opponent or nothing. The
+# grid is patched from the cells the engine reports changed, plus the
+# gradient section of the body whose shades move along it every tick, so a
+# tick costs the same however long the snake is. The raster renderer turns
+# the grid into pixels with one 8-bit surface blit and one scale, and agents
+# can take it as a pixel observation without pygame.
+#
+# cells is indexed [x, y] like pygame.surfarray, rgb() returns rows of pixels.
+
+# The palette indexes and their colors come from the palette module, the
+# atlas renderer uses the same ones for its tiles.
+
+class BoardRaster:
+    """Palette-indexed cell grid of one engine's board"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.colors = np.array(palette(engine.config), dtype=np.uint8)
+        self.cells = np.full((engine.cols, engine.rows), EMPTY, dtype=np.uint8)
+        # Gradient cells and opponent heads written last time, their index
+        # changes on the next tick without the engine touching the cell
+        self.window = []
+        self.opponent_heads = set()
+
+    def render(self):
+        # Rebuild the whole grid, after a reset or when nothing was tracked
+        engine = self.engine
+        self.cells.fill(EMPTY)
+        self.window = []
+        self.opponent_heads = set()
+        cells = set(engine.body_counts)
+        cells.update(engine.opponent_cells)
+        cells.update(engine.obstacles)
+        if engine.food is not None:
+            cells.add(engine.food)
+        if engine.power_up:
+            cells.add((engine.power_up.x, engine.power_up.y))
+        self.update(cells)
+
+    def update(self, changed):
+        # Patch the grid after a tick, changed are the cells the engine marked dirty
+        engine = self.engine
+        window = list(itertools.islice(engine.snake, GRADIENT_LENGTH))
+        opponent_heads = {opponent.snake[0] for opponent in engine.opponents if opponent.alive}
+        cells = set(changed)
+        cells.update(self.window)
+        cells.update(window)
+        cells.update(self.opponent_heads)
+
+        # The segment drawn last wins a cell, so keep the highest index
+        shades = {}
+        window_counts = {}
+        for i, cell in enumerate(window):
+            shades[cell] = i
+            window_counts[cell] = window_counts.get(cell, 0) + 1
+
+        power_up = engine.power_up
+        power_up_cell = (power_up.x, power_up.y) if power_up else None
+        cols = engine.cols
+        rows = engine.rows
+        xs = []
+        ys = []
+        indexes = []
+        for cell in cells:
+            x, y = cell
+            # A head that left the board has no cell to draw
+            if not (0 <= x < cols and 0 <= y < rows):
+                continue
+            if cell in engine.obstacles:
+                index = OBSTACLE
+            elif cell in engine.body_counts:
+                # A segment past the gradient on the same cell is drawn later
+                if engine.body_counts[cell] > window_counts.get(cell, 0):
+                    index = GRADIENT_LENGTH
+                else:
+                    index = shades[cell]
+            elif cell in engine.opponent_cells:
+                index = OPPONENT_HEAD if cell in opponent_heads else OPPONENT_BODY
+            elif cell == power_up_cell:
+                index = POWER_UP + power_up.type
+            elif cell == engine.food:
+                index = FOOD
+            else:
+                index = EMPTY
+            xs.append(x)
+            ys.append(y)
+            indexes.append(index)
+        if indexes:
+            self.cells[xs, ys] = indexes
+        self.window = window
+        self.opponent_heads = opponent_heads
+
+    def rgb(self, scale=1):
+        # (rows * scale, cols * scale, 3) uint8 array of the board, a cell per scale x scale pixels
+        pixels = self.colors[self.cells.T]
+        if scale > 1:
+            pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+        return pixels
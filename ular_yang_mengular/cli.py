@@ -0,0 +1,96 @@
+import argparse
+
+from .snake_engine import Config, fit_board
+from .levels import level_names, load_level
+
+# Command line entry point of Ular yang Mengular (the ular-yang-mengular
+# script, python -m ular_yang_mengular). Arguments are parsed before pygame
+# or anything else only some sessions need is imported, so --help and
+# --levels answer straight away and a game pays only for what it uses.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ular yang Mengular")
+    parser.add_argument("--record", metavar="DIR", help="save a replay of every game into DIR")
+    parser.add_argument("--replay", metavar="FILE", help="watch a recorded game instead of playing")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed for --replay")
+    parser.add_argument("--bots", type=int, metavar="N", help="add N computer-controlled snakes")
+    parser.add_argument("--arena", type=int, metavar="N", help="play one arena round against N snakes that all move at once")
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="join a round on a snake_net server")
+    parser.add_argument("--capture", metavar="DIR", help="record every frame into DIR without slowing the game")
+    parser.add_argument("--capture-format", choices=["png", "raw"], default="png",
+                        help="PNG sequence, or raw frames plus an index (cheapest)")
+    parser.add_argument("--board", metavar="COLSxROWS", help="board size in cells, e.g. 10000x10000")
+    parser.add_argument("--obstacles", type=int, metavar="N", help="obstacles per game")
+    parser.add_argument("--level", metavar="NAME", help="play a level from levels/ or a .lvl/.lvlc file")
+    parser.add_argument("--levels", action="store_true", help="list the levels in levels/ and exit")
+    parser.add_argument("--profile", action="store_true", help="show per-phase frame timings (p50/p99)")
+    parser.add_argument("--trace", metavar="FILE", help="write a frame timeline, Chrome trace JSON or .csv")
+    parser.add_argument("--cprofile", metavar="FILE", help="run the session under cProfile and write pstats")
+    args = parser.parse_args(argv)
+
+    if args.board and args.level:
+        # A level brings its own board size
+        parser.error("--board and --level cannot be used together")
+
+    config = Config()
+    if args.board:
+        cols, rows = (int(v) for v in args.board.lower().split("x"))
+        fit_board(config, cols, rows)
+    if args.levels:
+        print("\n".join(level_names()))
+        return
+    if args.level:
+        # The level decides the board size, and how many random obstacles
+        # join its walls unless --obstacles says otherwise
+        level = load_level(args.level)
+        fit_board(config, level.cols, level.rows)
+        config.LEVEL = args.level
+        config.OBSTACLE_COUNT = level.obstacles
+    if args.obstacles is not None:
+        config.OBSTACLE_COUNT = args.obstacles
+
+    # pygame and SDL are only loaded from here on
+    from .game import SnakeGame
+
+    game = SnakeGame(config)
+    if args.record:
+        game.config.REPLAY_DIR = args.record
+    if args.bots is not None:
+        game.config.OPPONENT_COUNT = args.bots
+    if args.profile or args.trace:
+        from .frame_profiler import FrameProfiler
+        game.profiler = FrameProfiler(overlay=args.profile)
+    if args.capture:
+        from .frame_capture import FrameCapture
+        game.capture = FrameCapture(game.screen, args.capture, args.capture_format)
+    profile = None
+    if args.cprofile:
+        import cProfile
+        profile = cProfile.Profile()
+
+    # Quitting exits through sys.exit, so the reports are written on the way out
+    try:
+        if profile:
+            profile.enable()
+        if args.replay:
+            from .replay import load_replay
+            game.play_replay(load_replay(args.replay), args.speed)
+        elif args.arena is not None:
+            game.play_arena(args.arena)
+        elif args.connect:
+            host, _, port = args.connect.partition(":")
+            game.play_online(host, int(port) if port else None)
+            # Whether the round was played or the server never answered, carry on in the menu
+            game.run()
+        else:
+            game.run()
+    finally:
+        game.stop_capture()
+        if profile:
+            profile.disable()
+            profile.dump_stats(args.cprofile)
+        if args.trace:
+            game.profiler.export(args.trace)
+
+if __name__ == "__main__":
+    main()
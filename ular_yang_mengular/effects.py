@@ -0,0 +1,152 @@
+import heapq
+from itertools import count
+
+# Timed effects for the snake engines, counted in simulation ticks.
+#
+# Effects live in a timer wheel: one bucket per tick modulo the wheel size,
+# so moving on a tick only looks at the bucket that comes due, however many
+# effects are queued. An effect due further out than one turn of the wheel
+# waits in a heap ordered by end tick and moves into its bucket once it is
+# less than a turn away, so no bucket holds effects due on a later lap.
+# Time only passes when the engine
+# steps, so pausing the game pauses every effect with it, and headless runs
+# expire effects on exactly the same tick every time.
+#
+# Alongside the wheel every (kind, owner) keeps a Stack: how many effects are
+# live plus heaps of their end ticks, so the engines can ask for stack counts,
+# the soonest end and the time left on every tick without walking the effects.
+
+class Effect:
+    """One timed effect, live from when it is scheduled until its end tick"""
+
+    def __init__(self, kind, end, owner=None, seq=0):
+        self.kind = kind
+        self.end = end
+        # Who the effect belongs to, e.g. an arena snake index, None for the whole game
+        self.owner = owner
+        # Order of scheduling, breaks ties between effects ending on the same tick
+        self.seq = seq
+        self.cancelled = False
+
+class Stack:
+    """Live effects of one kind and owner, with their soonest and latest ends at hand"""
+
+    def __init__(self):
+        self.count = 0
+        # (end, seq, effect) and (-end, seq, effect) heaps. Ended and cancelled
+        # effects are only dropped once they reach the top, or when the heaps
+        # have grown to twice the live count and are rebuilt.
+        self.soonest = []
+        self.latest = []
+
+class EffectScheduler:
+    """Timer wheel of stacking timed effects keyed on simulation ticks"""
+
+    def __init__(self, slots=256):
+        self.slots = slots
+        self.wheel = [[] for _ in range(slots)]
+        # (end, seq, effect) of effects a turn or more away
+        self.overflow = []
+        self.tick = 0
+        # {owner: {kind: Stack}} of everything live, a kind stacks once per effect
+        self.owners = {}
+        self.seq = count()
+
+    def schedule(self, kind, duration, owner=None):
+        # Start an effect lasting duration ticks from now, returns it for cancel()
+        effect = Effect(kind, self.tick + max(1, duration), owner, next(self.seq))
+        if effect.end - self.tick < self.slots:
+            self.wheel[effect.end % self.slots].append(effect)
+        else:
+            heapq.heappush(self.overflow, (effect.end, effect.seq, effect))
+        stack = self.owners.setdefault(owner, {}).get(kind)
+        if stack is None:
+            stack = self.owners[owner][kind] = Stack()
+        stack.count += 1
+        heapq.heappush(stack.soonest, (effect.end, effect.seq, effect))
+        heapq.heappush(stack.latest, (-effect.end, effect.seq, effect))
+        return effect
+
+    def advance(self):
+        # Move on one tick, returns the effects that ended on it
+        self.tick += 1
+        # Effects coming within a turn of the wheel take their bucket, the one
+        # that is just about to be reused for them at the latest
+        overflow = self.overflow
+        horizon = self.tick + self.slots
+        while overflow and overflow[0][0] < horizon:
+            effect = heapq.heappop(overflow)[2]
+            if not effect.cancelled:
+                self.wheel[effect.end % self.slots].append(effect)
+
+        slot = self.tick % self.slots
+        bucket = self.wheel[slot]
+        if not bucket:
+            return []
+
+        # Every effect in the bucket ends on this tick
+        self.wheel[slot] = []
+        expired = []
+        for effect in bucket:
+            if not effect.cancelled:
+                expired.append(effect)
+                self.remove(effect)
+        return expired
+
+    def cancel(self, effect):
+        # End an effect early, its wheel entry is skipped when its bucket comes due
+        if effect is None or effect.cancelled or effect.end <= self.tick:
+            return
+        effect.cancelled = True
+        self.remove(effect)
+
+    def remove(self, effect):
+        # Called once the effect has ended or been cancelled, its heap
+        # entries are left for top() or a rebuild to drop
+        kinds = self.owners[effect.owner]
+        stack = kinds[effect.kind]
+        stack.count -= 1
+        if not stack.count:
+            del kinds[effect.kind]
+            if not kinds:
+                del self.owners[effect.owner]
+        elif len(stack.soonest) > 2 * stack.count + 16:
+            stack.soonest = [entry for entry in stack.soonest if self.is_live(entry[2])]
+            stack.latest = [entry for entry in stack.latest if self.is_live(entry[2])]
+            heapq.heapify(stack.soonest)
+            heapq.heapify(stack.latest)
+
+    def is_live(self, effect):
+        return not effect.cancelled and effect.end > self.tick
+
+    def top(self, heap):
+        # The effect on top of one of a Stack's heaps, dropping dead ones on the way
+        while not self.is_live(heap[0][2]):
+            heapq.heappop(heap)
+        return heap[0][2]
+
+    def stack(self, kind, owner):
+        kinds = self.owners.get(owner)
+        return kinds.get(kind) if kinds else None
+
+    def count(self, kind, owner=None):
+        stack = self.stack(kind, owner)
+        return stack.count if stack else 0
+
+    def first(self, kind, owner=None):
+        # The live effect of a kind that ends soonest, None if there is none
+        stack = self.stack(kind, owner)
+        return self.top(stack.soonest) if stack else None
+
+    def ticks_left(self, kind, owner=None):
+        # Ticks until the last stacked effect of a kind runs out
+        stack = self.stack(kind, owner)
+        return self.top(stack.latest).end - self.tick if stack else 0
+
+    def active(self, owner=None):
+        # [(kind, stacks, ticks left)] of everything live for owner, by kind
+        kinds = self.owners.get(owner)
+        if not kinds:
+            return []
+        return sorted((kind, stack.count, self.top(stack.latest).end - self.tick)
+                      for kind, stack in kinds.items())
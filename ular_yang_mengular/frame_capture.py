@@ -0,0 +1,137 @@
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import pygame
+
+# Gameplay capture for Ular yang Mengular.
+#
+# Saving images in the game loop stalls the frame, so the loop only copies
+# the finished frame, straight out of the screen surface's pixel buffer, into
+# a ring of slots in shared memory. A writer process takes the frames out of
+# the ring and does the slow part, writing a PNG sequence or raw frames. When
+# every slot is still waiting on the writer the frame is dropped instead of
+# waiting, and the drops are counted.
+#
+# A capture directory holds:
+#   capture.json  size and pixel layout of the frames, frame and drop counts
+#   index.csv     frame number, seconds since the capture started, file, offset
+#   frame_NNNNNN.png, or frames.raw with every frame's pixels back to back
+#   exactly as the surface stores them (see capture.json for the layout)
+
+def to_rgb(data, layout):
+    # Packed RGB bytes from a copy of the surface's pixel buffer
+    width = layout["width"]
+    height = layout["height"]
+    step = layout["bytesize"]
+    row_bytes = width * step
+    if layout["pitch"] != row_bytes:
+        # Rows are padded, drop the padding first
+        pitch = layout["pitch"]
+        data = b"".join(data[y * pitch:y * pitch + row_bytes] for y in range(height))
+    rgb = bytearray(width * height * 3)
+    for channel, shift in enumerate(layout["shifts"][:3]):
+        rgb[channel::3] = data[shift // 8::step]
+    return rgb
+
+def write_frames(memory, busy, queue, directory, image_format, layout):
+    # Runs in the writer process until the capture sends None
+    frame_bytes = layout["pitch"] * layout["height"]
+    size = (layout["width"], layout["height"])
+    raw = open(os.path.join(directory, "frames.raw"), "wb") if image_format == "raw" else None
+    with open(os.path.join(directory, "index.csv"), "w") as index:
+        index.write("frame,time,file,offset\n")
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            slot, frame, timestamp = item
+            # Copy out and hand the slot back before the slow part
+            data = bytes(memory.buf[slot * frame_bytes:(slot + 1) * frame_bytes])
+            busy[slot] = 0
+            if raw is not None:
+                index.write(f"{frame},{timestamp:.6f},frames.raw,{raw.tell()}\n")
+                raw.write(data)
+            else:
+                name = f"frame_{frame:06d}.png"
+                image = pygame.image.frombuffer(to_rgb(data, layout), size, "RGB")
+                pygame.image.save(image, os.path.join(directory, name))
+                index.write(f"{frame},{timestamp:.6f},{name},0\n")
+    if raw is not None:
+        raw.close()
+    memory.close()
+
+class FrameCapture:
+    """Copies rendered frames into a shared-memory ring drained by a writer process"""
+
+    def __init__(self, surface, directory, image_format="png", slots=16):
+        if image_format not in ("png", "raw"):
+            raise ValueError(f"unknown capture format {image_format!r}, use png or raw")
+        self.directory = directory
+        self.image_format = image_format
+        self.slots = slots
+        width, height = surface.get_size()
+        self.layout = {
+            "width": width,
+            "height": height,
+            "pitch": surface.get_pitch(),
+            "bytesize": surface.get_bytesize(),
+            "shifts": list(surface.get_shifts()),
+            "masks": list(surface.get_masks()),
+        }
+        self.frame_bytes = self.layout["pitch"] * height
+        os.makedirs(directory, exist_ok=True)
+
+        context = multiprocessing.get_context()
+        self.memory = shared_memory.SharedMemory(create=True, size=slots * self.frame_bytes)
+        # 1 while a slot holds a frame the writer has not copied out yet
+        self.busy = context.RawArray("b", slots)
+        self.queue = context.Queue()
+        self.process = context.Process(
+            target=write_frames, name="frame-capture", daemon=True,
+            args=(self.memory, self.busy, self.queue, directory, image_format, self.layout))
+        self.process.start()
+
+        self.slot = 0
+        self.frames = 0
+        self.captured = 0
+        self.dropped = 0
+        self.start = time.perf_counter()
+        self.closed = False
+
+    def grab(self, surface):
+        # Copy one frame into the ring, False if it had to be dropped
+        frame = self.frames
+        self.frames += 1
+        slot = self.slot
+        if self.busy[slot] or surface.get_pitch() * surface.get_height() != self.frame_bytes:
+            # The writer is behind (or the window changed size), never wait for it
+            self.dropped += 1
+            return False
+        offset = slot * self.frame_bytes
+        pixels = surface.get_buffer()
+        self.memory.buf[offset:offset + self.frame_bytes] = pixels
+        # The surface stays locked while its buffer is referenced
+        del pixels
+        self.busy[slot] = 1
+        self.queue.put((slot, frame, time.perf_counter() - self.start))
+        self.slot = (slot + 1) % self.slots
+        self.captured += 1
+        return True
+
+    def close(self):
+        # Waits for the writer to finish and returns (frames captured, frames dropped)
+        if self.closed:
+            return self.captured, self.dropped
+        self.closed = True
+        self.queue.put(None)
+        self.process.join()
+        self.memory.close()
+        self.memory.unlink()
+        info = dict(self.layout, format=self.image_format, frames=self.frames,
+                    captured=self.captured, dropped=self.dropped)
+        with open(os.path.join(self.directory, "capture.json"), "w") as f:
+            json.dump(info, f, indent=2)
+        return self.captured, self.dropped
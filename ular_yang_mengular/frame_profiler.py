@@ -0,0 +1,118 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Opt-in frame profiler for SnakeGame.run.
+# Each frame is split into named phases (input, update, draw, flip, sleep...).
+# Rolling p50/p99 per phase can be shown in an overlay, and every phase
+# instance can be exported as a Chrome trace (chrome://tracing, Perfetto) or CSV.
+
+PHASE_ORDER = ("input", "update", "draw", "draw_side_panel", "flip", "sleep", "frame")
+
+class FrameProfiler:
+    """Times the phases of each frame and keeps rolling percentiles"""
+
+    def __init__(self, window=300, max_events=1000000, overlay=True):
+        self.window = window
+        self.overlay = overlay
+        self.samples = {}
+        self.current = {}
+        self.frame = 0
+        self.origin = time.perf_counter()
+        self.frame_start = self.origin
+        # Time spent in nested phases, so each phase's percentiles are
+        # exclusive: draw does not include the draw_side_panel and flip inside it
+        self.child_time = []
+        # (frame, phase, start seconds, duration seconds), oldest dropped first
+        self.events = deque(maxlen=max_events)
+        # Overlay lines are recomputed a few times a second, not every frame
+        self.overlay_lines = []
+        self.overlay_frame = -1
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        self.child_time.append(0.0)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            children = self.child_time.pop()
+            if self.child_time:
+                self.child_time[-1] += duration
+            self.record(name, start, duration, duration - children)
+
+    def record(self, name, start, duration, exclusive=None):
+        # A phase can run several times in one frame (catch-up ticks), sum them
+        if exclusive is None:
+            exclusive = duration
+        self.current[name] = self.current.get(name, 0.0) + exclusive
+        self.events.append((self.frame, name, start - self.origin, duration))
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.record("frame", self.frame_start, now - self.frame_start)
+        for name, duration in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(duration)
+        self.current = {}
+        self.frame += 1
+        self.frame_start = now
+
+    def percentile(self, name, q):
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+    def summary(self):
+        # {phase: (p50 ms, p99 ms)} over the last `window` frames
+        names = [name for name in PHASE_ORDER if name in self.samples]
+        names += sorted(name for name in self.samples if name not in PHASE_ORDER)
+        return {name: (self.percentile(name, 0.5) * 1000, self.percentile(name, 0.99) * 1000)
+                for name in names}
+
+    def draw_overlay(self, screen, text, area, color=(255, 255, 0), background=(0, 0, 0)):
+        # Draws the rolling percentiles into area (x, y, width, height), returns the area
+        if self.frame - self.overlay_frame >= 15 or not self.overlay_lines:
+            self.overlay_lines = [f"{name} p50 {p50:.2f} p99 {p99:.2f} ms"
+                                  for name, (p50, p99) in self.summary().items()]
+            self.overlay_frame = self.frame
+
+        x, y, width, height = area
+        screen.fill(background, area)
+        column_width = 300
+        line_height = 20
+        per_column = max(1, height // line_height)
+        for i, line in enumerate(self.overlay_lines):
+            column, row = divmod(i, per_column)
+            if (column + 1) * column_width > width:
+                break
+            screen.blit(text.render(line, 22, color), (x + 10 + column * column_width, y + 5 + row * line_height))
+        return area
+
+    def export(self, path):
+        # The file extension picks the format
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+    def export_chrome_trace(self, path):
+        events = [{"name": name, "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                   "ts": round(start * 1e6, 3), "dur": round(duration * 1e6, 3),
+                   "args": {"frame": frame}}
+                  for frame, name, start, duration in self.events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "phase", "start_ms", "duration_ms"])
+            for frame, name, start, duration in self.events:
+                writer.writerow([frame, name, f"{start * 1000:.3f}", f"{duration * 1000:.3f}"])
@@ -0,0 +1,779 @@
+import contextlib
+import sys
+import os
+import time
+
+import pygame
+
+from .snake_engine import Config, SnakeEngine, POWER_UP_NAMES, UP, DOWN, LEFT, RIGHT, uses_camera
+from .snake_arena import ArenaEngine
+from .replay import ReplayRecorder
+from .score_store import BackgroundWriter, ScoreStore
+from .snake_render import (AtlasRenderer, CameraRenderer, DirtyRectRenderer, RasterRenderer, TextCache,
+                          bake_grid, interpolated_head_rect, interpolated_tail_rect, power_up_color, segment_color)
+
+# Head colors of the snakes in arena mode, the player's first
+ARENA_COLORS = [(0, 255, 0), (255, 140, 0), (0, 160, 255), (255, 255, 0),
+                (255, 0, 255), (0, 255, 255), (255, 100, 100), (180, 180, 255)]
+
+# Stand-in for profiler phases when profiling is off
+NO_PHASE = contextlib.nullcontext()
+
+# Game state management
+class GameState:
+    MENU = 0
+    PLAYING = 1
+    PAUSED = 2
+    GAME_OVER = 3
+
+class SnakeGame:
+    def __init__(self, config=None):
+        # Only what the game uses: pygame.init() would also start audio,
+        # joysticks and the rest, which costs startup time for nothing
+        pygame.display.init()
+        pygame.font.init()
+        self.config = config or Config()
+        self.screen = pygame.display.set_mode((self.config.WIDTH, self.config.HEIGHT))
+        pygame.display.set_caption("Ular yang Mengular v2.0")
+        self.clock = pygame.time.Clock()
+
+        # Fonts are loaded once and rendered strings are reused across frames
+        self.text = TextCache()
+
+        # Optional FrameProfiler timing each phase of every frame
+        self.profiler = None
+        # FrameCapture copying every presented frame out, None when not recording video
+        self.capture = None
+
+        # Game state
+        self.state = GameState.MENU
+        self.difficulty = "Medium"
+
+        # Headless simulation, this class only handles input and rendering
+        self.engine = SnakeEngine(self.config, self.difficulty)
+        self.next_direction = None
+        # Writes the current game to Config.REPLAY_DIR when recording is on
+        self.recorder = None
+        # How far the simulation is into the next tick, 0..1, used to
+        # interpolate the snake while rendering faster than it moves
+        self.alpha = 1.0
+
+        # Optional renderer replacing the full redraw in draw_game
+        self.renderer = self.make_renderer()
+        # Grid the arena modes draw their snakes over, baked on first use
+        self.arena_grid = None
+
+        # Initialize game elements
+        self.reset_game()
+
+        # Load high scores. Reads happen here once, new scores are written by a
+        # background thread so game over never waits on the disk.
+        db_path = os.path.join(os.getcwd(), self.config.SCORE_DB)
+        self.scores = ScoreStore(db_path, os.path.join(os.getcwd(), "high_scores.json"))
+        self.score_writer = BackgroundWriter(db_path)
+        self.high_scores = self.load_high_scores()
+        self.session_high_score = 0
+
+    def make_renderer(self):
+        # Boards bigger than the game area need the camera, otherwise
+        # Config.RENDER_MODE picks between the full redraw, dirty rects, the
+        # tile atlas and the NumPy raster
+        if uses_camera(self.config):
+            return CameraRenderer(self)
+        if self.config.RENDER_MODE == "dirty":
+            return DirtyRectRenderer(self)
+        if self.config.RENDER_MODE == "atlas":
+            return AtlasRenderer(self)
+        if self.config.RENDER_MODE == "raster":
+            return RasterRenderer(self)
+        return None
+
+    def reset_game(self):
+        self.engine.difficulty = self.difficulty
+        self.engine.reset()
+        self.next_direction = None
+
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.config.REPLAY_DIR:
+            os.makedirs(self.config.REPLAY_DIR, exist_ok=True)
+            name = time.strftime("replay-%Y%m%d-%H%M%S") + f"-{self.engine.seed:016x}.ulr"
+            self.recorder = ReplayRecorder(os.path.join(self.config.REPLAY_DIR, name), self.engine)
+
+    def run(self):
+        running = True
+        previous_state = None
+        accumulator = 0.0
+        frame_time = 0.0
+        while running:
+            if self.state != previous_state:
+                # Menus and overlays draw over the board, so repaint it in full after them
+                if self.renderer:
+                    self.renderer.invalidate()
+                accumulator = 0.0
+            previous_state = self.state
+
+            if self.state == GameState.MENU:
+                with self.phase("input"):
+                    self.handle_menu_input()
+                with self.phase("draw"):
+                    self.draw_menu()
+
+            elif self.state == GameState.PLAYING:
+                # Input and rendering run every frame, the simulation runs
+                # fixed ticks at the difficulty speed out of the accumulated time
+                with self.phase("input"):
+                    self.handle_gameplay_input()
+                with self.phase("update"):
+                    tick_time = 1.0 / self.engine.tick_rate()
+                    accumulator = min(accumulator + frame_time, tick_time * self.config.MAX_TICKS_PER_FRAME)
+                    while accumulator >= tick_time and self.state == GameState.PLAYING:
+                        accumulator -= tick_time
+                        self.update_game()
+                        tick_time = 1.0 / self.engine.tick_rate()
+                # A finished game is shown exactly where it ended
+                self.alpha = min(1.0, accumulator / tick_time) if self.state == GameState.PLAYING else 1.0
+                with self.phase("draw"):
+                    self.draw_game()
+
+            elif self.state == GameState.PAUSED:
+                with self.phase("input"):
+                    self.handle_pause_input()
+                with self.phase("draw"):
+                    self.pause_game()
+
+            elif self.state == GameState.GAME_OVER:
+                self.game_over()
+
+            # Frames run at the display rate, game speed is set by the tick rate
+            with self.phase("sleep"):
+                frame_time = self.clock.tick(self.config.RENDER_FPS) / 1000.0
+            if self.profiler:
+                self.profiler.end_frame()
+
+    def phase(self, name):
+        # Timing scope for the frame profiler, does nothing when profiling is off
+        return self.profiler.phase(name) if self.profiler else NO_PHASE
+
+    def present(self, rects=None):
+        # Push the frame to the display, only the given rects if there are any
+        if self.profiler and self.profiler.overlay:
+            area = (0, self.config.GAME_HEIGHT, self.config.WIDTH, self.config.HEIGHT - self.config.GAME_HEIGHT)
+            self.profiler.draw_overlay(self.screen, self.text, area)
+            if rects is not None:
+                rects.append(pygame.Rect(area))
+        with self.phase("flip"):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        if self.capture:
+            with self.phase("capture"):
+                self.capture.grab(self.screen)
+
+    def load_high_scores(self):
+        return self.scores.top(5)
+
+    def save_high_score(self):
+        entry = {
+            "score": self.engine.score,
+            "player": "Player",
+            "difficulty": self.difficulty,
+            "timestamp": int(time.time())
+        }
+        # Every run is kept, the write is handed to the background writer
+        self.score_writer.add(**entry)
+
+        # The screen only shows the top 5, keep that list up to date in memory
+        self.high_scores.append(entry)
+        self.high_scores.sort(key=lambda x: x["score"], reverse=True)
+        self.high_scores = self.high_scores[:5]
+
+        # Update session high score
+        self.session_high_score = max(self.session_high_score, self.engine.score)
+
+    def quit(self):
+        # Finish pending score and replay writes before the process goes away
+        self.score_writer.close()
+        if self.recorder:
+            self.recorder.close()
+        self.stop_capture()
+        pygame.quit()
+        sys.exit()
+
+    def stop_capture(self):
+        if self.capture:
+            captured, dropped = self.capture.close()
+            print(f"Captured {captured} frames to {self.capture.directory}, dropped {dropped}")
+            self.capture = None
+
+    def draw_menu(self):
+        self.screen.fill(self.config.BLACK)
+
+        # Title
+        title = self.text.render("ULAR YANG MENGULAR", 72, self.config.GREEN)
+        self.screen.blit(title, (self.config.WIDTH // 2 - title.get_width() // 2, 100))
+
+        # Menu options
+        # Difficulty selection
+        difficulty_text = self.text.render(f"Difficulty: < {self.difficulty} >", 36, self.config.WHITE)
+        self.screen.blit(difficulty_text, (self.config.WIDTH // 2 - difficulty_text.get_width() // 2, 250))
+
+        # Start game button
+        pygame.draw.rect(self.screen, self.config.GREEN,
+                         (self.config.WIDTH // 2 - 100, 320, 200, 50),
+                         border_radius=5)
+        start_text = self.text.render("Start Game", 36, self.config.BLACK)
+        self.screen.blit(start_text, (self.config.WIDTH // 2 - start_text.get_width() // 2, 335))
+
+        # High scores button
+        pygame.draw.rect(self.screen, self.config.BLUE,
+                         (self.config.WIDTH // 2 - 100, 390, 200, 50),
+                         border_radius=5)
+        high_scores_text = self.text.render("High Scores", 36, self.config.BLACK)
+        self.screen.blit(high_scores_text, (self.config.WIDTH // 2 - high_scores_text.get_width() // 2, 405))
+
+        # Quit button
+        pygame.draw.rect(self.screen, self.config.RED,
+                         (self.config.WIDTH // 2 - 100, 460, 200, 50),
+                         border_radius=5)
+        quit_text = self.text.render("Quit", 36, self.config.BLACK)
+        self.screen.blit(quit_text, (self.config.WIDTH // 2 - quit_text.get_width() // 2, 475))
+
+        # Instructions
+        instruction_text = self.text.render("Use arrow keys to navigate, SPACE to select", 36, self.config.GRAY)
+        self.screen.blit(instruction_text, (self.config.WIDTH // 2 - instruction_text.get_width() // 2, 550))
+
+        self.present()
+
+    def draw_game(self):
+        if self.renderer:
+            self.renderer.draw()
+            return
+
+        self.screen.fill(self.config.BLACK)
+
+        # Draw grid
+        for x in range(0, self.config.GAME_WIDTH, self.config.GRID_SIZE):
+            pygame.draw.line(self.screen, self.config.GRAY, (x, 0), (x, self.config.GAME_HEIGHT))
+        for y in range(0, self.config.GAME_HEIGHT, self.config.GRID_SIZE):
+            pygame.draw.line(self.screen, self.config.GRAY, (0, y), (self.config.GAME_WIDTH, y))
+
+        engine = self.engine
+        grid = self.config.GRID_SIZE
+
+        # Draw food, there is none once the snake has filled the board
+        if engine.food is not None:
+            pygame.draw.rect(self.screen, self.config.RED,
+                             (engine.food[0] * grid, engine.food[1] * grid, grid, grid))
+
+        # Draw power-up if exists
+        power_up = engine.power_up
+        if power_up:
+            color = self.config.YELLOW if power_up.type == 0 else \
+                    self.config.PURPLE if power_up.type == 1 else \
+                    self.config.BLUE
+            pygame.draw.rect(self.screen, color,
+                            (power_up.x * grid, power_up.y * grid, grid, grid))
+
+        # Draw opponents, they move a whole cell per tick
+        for opponent in engine.opponents:
+            for i, segment in enumerate(opponent.snake):
+                color = self.config.ORANGE if i == 0 else self.config.DARK_ORANGE
+                pygame.draw.rect(self.screen, color, (segment[0] * grid, segment[1] * grid, grid, grid))
+
+        # Draw snake, between ticks the head and tail slide to their new cells
+        interpolate = self.config.INTERPOLATE and self.alpha < 1
+        if interpolate:
+            tail_rect = interpolated_tail_rect(self.config, engine, self.alpha)
+            if tail_rect:
+                pygame.draw.rect(self.screen, segment_color(self.config, len(engine.snake)), tail_rect)
+
+        for i, segment in enumerate(engine.snake):
+            # Head in a different color
+            if i == 0 and interpolate:
+                continue
+            if i == 0:
+                color = self.config.GREEN
+            else:
+                # Body segments have a gradient effect
+                green_val = max(0, 255 - i * 5)
+                color = (0, green_val, 0)
+
+            pygame.draw.rect(self.screen, color,
+                            (segment[0] * grid, segment[1] * grid, grid, grid))
+
+        if interpolate:
+            pygame.draw.rect(self.screen, self.config.GREEN, interpolated_head_rect(self.config, engine, self.alpha))
+
+        # Draw obstacles
+        for obs in engine.obstacles:
+            pygame.draw.rect(self.screen, self.config.PURPLE, (obs[0] * grid, obs[1] * grid, grid, grid))
+
+        # Draw side panel
+        with self.phase("draw_side_panel"):
+            self.draw_side_panel()
+
+        self.present()
+
+    def draw_side_panel(self):
+        panel_x = self.config.GAME_WIDTH + 10
+        panel_width = self.config.WIDTH - self.config.GAME_WIDTH - 20
+
+        # Panel background
+        pygame.draw.rect(self.screen, self.config.GRAY,
+                         (panel_x, 10, panel_width, self.config.GAME_HEIGHT - 20),
+                         border_radius=5)
+
+        # Game info
+        # Score
+        score_text = self.text.render(f"Score: {self.engine.score}", 36, self.config.WHITE)
+        self.screen.blit(score_text, (panel_x + 20, 30))
+
+        # Session high score
+        high_score_text = self.text.render(f"High: {self.session_high_score}", 36, self.config.WHITE)
+        self.screen.blit(high_score_text, (panel_x + 20, 70))
+
+        # Difficulty
+        difficulty_text = self.text.render(f"Difficulty: {self.difficulty}", 36, self.config.WHITE)
+        self.screen.blit(difficulty_text, (panel_x + 20, 110))
+
+        # Active power-ups, stacked ones show how many are running
+        effects = self.active_effects()
+        if effects:
+            power_up_text = self.text.render(f"Power-ups:", 36, self.config.YELLOW)
+            self.screen.blit(power_up_text, (panel_x + 20, 160))
+
+            y = 190
+            for power_up_type, stacks, time_left in effects:
+                power_up_name = POWER_UP_NAMES[power_up_type]
+                if stacks > 1:
+                    power_up_name = f"{power_up_name} x{stacks}"
+                power_up_name_text = self.text.render(power_up_name, 36, self.config.YELLOW)
+                self.screen.blit(power_up_name_text, (panel_x + 20, y))
+
+                time_text = self.text.render(f"Time: {time_left:.1f}s", 36, self.config.YELLOW)
+                self.screen.blit(time_text, (panel_x + 20, y + 30))
+                y += 70
+
+    def active_effects(self):
+        # [(power-up type, stacks, seconds left)] of the running effects. The
+        # engine counts down in ticks, take off the part of the current tick
+        # that has already gone by so the timers run smoothly.
+        tick_rate = self.engine.tick_rate()
+        return [(power_up_type, stacks, max(0, (ticks_left - self.alpha) / tick_rate))
+                for power_up_type, stacks, ticks_left in self.engine.active_effects()]
+
+    def pause_game(self):
+        # Draw a semi-transparent overlay
+        overlay = pygame.Surface((self.config.WIDTH, self.config.HEIGHT))
+        overlay.set_alpha(150)
+        overlay.fill(self.config.BLACK)
+        self.screen.blit(overlay, (0, 0))
+
+        # Display pause text
+        pause_text = self.text.render("Game Paused", 48, self.config.WHITE)
+        continue_text = self.text.render("Press C to Continue", 48, self.config.WHITE)
+        quit_text = self.text.render("Press Q to Quit", 48, self.config.WHITE)
+
+        self.screen.blit(pause_text, (self.config.WIDTH // 2 - pause_text.get_width() // 2, self.config.HEIGHT // 2 - 60))
+        self.screen.blit(continue_text, (self.config.WIDTH // 2 - continue_text.get_width() // 2, self.config.HEIGHT // 2))
+        self.screen.blit(quit_text, (self.config.WIDTH // 2 - quit_text.get_width() // 2, self.config.HEIGHT // 2 + 60))
+
+        self.present()
+
+    def show_high_scores(self):
+        self.screen.fill(self.config.BLACK)
+
+        # Title
+        title = self.text.render("High Scores", 48, self.config.WHITE)
+        self.screen.blit(title, (self.config.WIDTH // 2 - title.get_width() // 2, 50))
+
+        # Display high scores
+        y_pos = 120
+
+        if not self.high_scores:
+            no_scores_text = self.text.render("No high scores yet!", 36, self.config.WHITE)
+            self.screen.blit(no_scores_text, (self.config.WIDTH // 2 - no_scores_text.get_width() // 2, y_pos))
+        else:
+            for i, entry in enumerate(self.high_scores):
+                score_text = self.text.render(f"{i+1}. {entry['score']} points", 36, self.config.WHITE)
+                self.screen.blit(score_text, (self.config.WIDTH // 2 - 120, y_pos))
+
+                # Convert timestamp to readable date if available
+                if 'timestamp' in entry:
+                    date = time.strftime('%Y-%m-%d', time.localtime(entry['timestamp']))
+                    date_text = self.text.render(date, 36, self.config.GRAY)
+                    self.screen.blit(date_text, (self.config.WIDTH // 2 + 80, y_pos))
+
+                y_pos += 50
+
+        # Back button
+        pygame.draw.rect(self.screen, self.config.RED,
+                         (self.config.WIDTH // 2 - 100, self.config.HEIGHT - 100, 200, 50),
+                         border_radius=5)
+        back_text = self.text.render("Back", 36, self.config.BLACK)
+        self.screen.blit(back_text, (self.config.WIDTH // 2 - back_text.get_width() // 2, self.config.HEIGHT - 85))
+
+        self.present()
+
+        # Wait for key press
+        waiting = True
+        while waiting:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
+                        waiting = False
+
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    mouse_pos = pygame.mouse.get_pos()
+                    # Check if back button is clicked
+                    if (self.config.WIDTH // 2 - 100 <= mouse_pos[0] <= self.config.WIDTH // 2 + 100 and
+                        self.config.HEIGHT - 100 <= mouse_pos[1] <= self.config.HEIGHT - 50):
+                        waiting = False
+
+    def game_over(self):
+        self.save_high_score()
+
+        # Game over screen
+        overlay = pygame.Surface((self.config.WIDTH, self.config.HEIGHT))
+        overlay.set_alpha(200)
+        overlay.fill(self.config.BLACK)
+        self.screen.blit(overlay, (0, 0))
+
+        # Changed message here
+        if self.engine.won:
+            game_over_text = self.text.render("YOU WIN", 72, self.config.GREEN)
+            try_again_text = self.text.render("The board is full!", 36, self.config.YELLOW)
+        else:
+            game_over_text = self.text.render("GAME OVER", 72, self.config.RED)
+            try_again_text = self.text.render("Try Again!", 36, self.config.YELLOW)
+        score_text = self.text.render(f"Your Score: {self.engine.score}", 36, self.config.WHITE)
+
+        continue_text = self.text.render("Press SPACE to Play Again", 36, self.config.WHITE)
+        menu_text = self.text.render("Press ESC for Main Menu", 36, self.config.WHITE)
+
+        self.screen.blit(game_over_text,
+                         (self.config.WIDTH // 2 - game_over_text.get_width() // 2, self.config.HEIGHT // 2 - 120))
+        self.screen.blit(try_again_text,
+                         (self.config.WIDTH // 2 - try_again_text.get_width() // 2, self.config.HEIGHT // 2 - 60))
+        self.screen.blit(score_text,
+                         (self.config.WIDTH // 2 - score_text.get_width() // 2, self.config.HEIGHT // 2 - 20))
+        self.screen.blit(continue_text,
+                         (self.config.WIDTH // 2 - continue_text.get_width() // 2, self.config.HEIGHT // 2 + 40))
+        self.screen.blit(menu_text,
+                         (self.config.WIDTH // 2 - menu_text.get_width() // 2, self.config.HEIGHT // 2 + 80))
+
+        # Saving happens in the background, show it if an earlier save failed
+        if self.score_writer.last_error:
+            error_text = self.text.render("Could not save high scores", 36, self.config.RED)
+            self.screen.blit(error_text,
+                             (self.config.WIDTH // 2 - error_text.get_width() // 2, self.config.HEIGHT // 2 + 140))
+
+        self.present()
+
+        # Wait for player decision
+        waiting = True
+        while waiting:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        # Restart game
+                        self.reset_game()
+                        self.state = GameState.PLAYING
+                        waiting = False
+                    elif event.key == pygame.K_ESCAPE:
+                        # Return to menu
+                        self.state = GameState.MENU
+                        waiting = False
+
+    def handle_menu_input(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit()
+
+            # Keyboard navigation
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    # Change difficulty
+                    difficulties = list(self.config.DIFFICULTY_SPEEDS.keys())
+                    current_index = difficulties.index(self.difficulty)
+                    self.difficulty = difficulties[(current_index - 1) % len(difficulties)]
+
+                elif event.key == pygame.K_RIGHT:
+                    # Change difficulty
+                    difficulties = list(self.config.DIFFICULTY_SPEEDS.keys())
+                    current_index = difficulties.index(self.difficulty)
+                    self.difficulty = difficulties[(current_index + 1) % len(difficulties)]
+
+                elif event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
+                    # Start game with current settings
+                    self.reset_game()
+                    self.state = GameState.PLAYING
+
+            # Mouse interaction
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_pos = pygame.mouse.get_pos()
+
+                # Start Game button
+                if (self.config.WIDTH // 2 - 100 <= mouse_pos[0] <= self.config.WIDTH // 2 + 100 and
+                    320 <= mouse_pos[1] <= 370):
+                    self.reset_game()
+                    self.state = GameState.PLAYING
+
+                # High Scores button
+                elif (self.config.WIDTH // 2 - 100 <= mouse_pos[0] <= self.config.WIDTH // 2 + 100 and
+                      390 <= mouse_pos[1] <= 440):
+                    self.show_high_scores()
+
+                # Quit button
+                elif (self.config.WIDTH // 2 - 100 <= mouse_pos[0] <= self.config.WIDTH // 2 + 100 and
+                      460 <= mouse_pos[1] <= 510):
+                    self.quit()
+
+    def handle_gameplay_input(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit()
+
+            if event.type == pygame.KEYDOWN:
+                # Turns are applied by the engine on the next tick
+                if event.key == pygame.K_UP:
+                    self.next_direction = UP
+                elif event.key == pygame.K_DOWN:
+                    self.next_direction = DOWN
+                elif event.key == pygame.K_LEFT:
+                    self.next_direction = LEFT
+                elif event.key == pygame.K_RIGHT:
+                    self.next_direction = RIGHT
+                elif event.key == pygame.K_SPACE:
+                    self.state = GameState.PAUSED
+                elif event.key == pygame.K_ESCAPE:
+                    self.state = GameState.MENU
+
+    def handle_pause_input(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_c:
+                    self.state = GameState.PLAYING
+                elif event.key == pygame.K_q:
+                    self.state = GameState.MENU
+
+    def update_game(self):
+        # Advance the simulation by one tick
+        if self.recorder:
+            self.recorder.step(self.next_direction)
+        else:
+            self.engine.step(self.next_direction)
+        self.next_direction = None
+
+        if self.engine.done:
+            self.state = GameState.GAME_OVER
+
+    def play_replay(self, replay, speed=1.0):
+        # Watch a recorded game at any speed, ESC or closing the window stops it
+        self.engine = replay.make_engine(self.config)
+        self.difficulty = replay.difficulty
+        self.state = GameState.PLAYING
+        self.renderer = self.make_renderer()
+
+        accumulator = 0.0
+        frame_time = 0.0
+        while not self.engine.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
+
+            tick_time = 1.0 / (self.engine.tick_rate() * speed)
+            accumulator = min(accumulator + frame_time,
+                              tick_time * self.config.MAX_TICKS_PER_FRAME * max(1.0, speed))
+            while accumulator >= tick_time and not self.engine.done:
+                accumulator -= tick_time
+                self.engine.step(replay.events.get(self.engine.ticks + 1))
+                tick_time = 1.0 / (self.engine.tick_rate() * speed)
+            self.alpha = min(1.0, accumulator / tick_time) if not self.engine.done else 1.0
+            self.draw_game()
+
+            frame_time = self.clock.tick(self.config.RENDER_FPS) / 1000.0
+
+    def play_arena(self, bots=3):
+        # You against `bots` computer snakes, all moving at the same time.
+        # ESC or the end of the round goes back to the caller.
+        arena = ArenaEngine(self.config, self.difficulty, humans=1, bots=bots)
+        direction = None
+        accumulator = 0.0
+        frame_time = 0.0
+        while not arena.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return
+                    direction = {pygame.K_UP: UP, pygame.K_DOWN: DOWN,
+                                 pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}.get(event.key, direction)
+
+            tick_time = 1.0 / arena.tick_rate()
+            accumulator = min(accumulator + frame_time, tick_time * self.config.MAX_TICKS_PER_FRAME)
+            while accumulator >= tick_time and not arena.done:
+                accumulator -= tick_time
+                arena.step([direction])
+                direction = None
+                tick_time = 1.0 / arena.tick_rate()
+            self.draw_arena(arena)
+
+            frame_time = self.clock.tick(self.config.RENDER_FPS) / 1000.0
+
+        self.show_arena_result(arena)
+
+    def play_online(self, host, port=None):
+        # Join a round on a snake_net server, see the snake_net module for hosting one.
+        # asyncio is only loaded for online play, it slows down every start.
+        import asyncio
+        from .snake_net import DEFAULT_PORT
+
+        asyncio.run(self.play_online_round(host, port or DEFAULT_PORT))
+
+    async def play_online_round(self, host, port):
+        import asyncio
+        from .snake_net import GameClient
+
+        client = GameClient(self.config)
+        connecting = asyncio.create_task(client.connect(host, port))
+        # The round starts once every player is in, keep the window alive meanwhile
+        while not connecting.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    connecting.cancel()
+                    client.close()
+                    return
+            self.screen.fill(self.config.BLACK)
+            waiting_text = self.text.render(f"Waiting for players on {host}:{port}...", 48, self.config.WHITE)
+            self.screen.blit(waiting_text, (self.config.WIDTH // 2 - waiting_text.get_width() // 2,
+                                            self.config.HEIGHT // 2 - 24))
+            self.present()
+            await asyncio.sleep(1.0 / self.config.RENDER_FPS)
+        try:
+            connecting.result()
+        except OSError as error:
+            # Refused, unreachable or closed before the round started
+            client.close()
+            self.show_connect_error(host, port, error)
+            return
+
+        receiving = asyncio.create_task(client.run())
+        try:
+            while not client.done:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.quit()
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            return
+                        client.turn({pygame.K_UP: UP, pygame.K_DOWN: DOWN,
+                                     pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}.get(event.key))
+                # Our own snake is drawn where the prediction has it, the rest as the server last said
+                self.draw_arena(client, client.index, client.predicted_snake())
+                await asyncio.sleep(1.0 / self.config.RENDER_FPS)
+        finally:
+            receiving.cancel()
+            client.close()
+        self.draw_arena(client, client.index)
+        self.show_arena_result(client, client.index)
+
+    def show_connect_error(self, host, port, error):
+        # Shown until a key is pressed, then it is back to the menu
+        self.screen.fill(self.config.BLACK)
+        error_text = self.text.render(f"Could not connect to {host}:{port}", 48, self.config.RED)
+        reason_text = self.text.render(error.strerror or str(error) or type(error).__name__, 24, self.config.WHITE)
+        self.screen.blit(error_text, (self.config.WIDTH // 2 - error_text.get_width() // 2,
+                                      self.config.HEIGHT // 2 - 48))
+        self.screen.blit(reason_text, (self.config.WIDTH // 2 - reason_text.get_width() // 2,
+                                       self.config.HEIGHT // 2 + 12))
+        self.present()
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN:
+                    return
+            self.clock.tick(self.config.RENDER_FPS)
+
+    def show_arena_result(self, arena, me=0):
+        # Round over, show who won until a key is pressed
+        if arena.winner is None:
+            result = "Nobody wins"
+        elif arena.winner.index == me:
+            result = "YOU WIN"
+        else:
+            result = f"{self.arena_name(arena.winner, me)} wins"
+        result_text = self.text.render(result, 72, self.config.YELLOW)
+        self.screen.blit(result_text, (self.config.GAME_WIDTH // 2 - result_text.get_width() // 2,
+                                       self.config.GAME_HEIGHT // 2 - 36))
+        self.present()
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                if event.type == pygame.KEYDOWN:
+                    return
+            self.clock.tick(self.config.RENDER_FPS)
+
+    def arena_name(self, snake, me=0):
+        if snake.index == me:
+            return "You"
+        return f"Snake {snake.index + 1}" if snake.bot else f"Player {snake.index + 1}"
+
+    def draw_arena(self, arena, me=0, own_snake=None):
+        # own_snake replaces the cells of snake `me`, for drawing a predicted position
+        self.screen.fill(self.config.BLACK)
+        if self.arena_grid is None:
+            self.arena_grid = bake_grid(self.config)
+        self.screen.blit(self.arena_grid, (0, 0))
+        grid = self.config.GRID_SIZE
+
+        if arena.food is not None:
+            pygame.draw.rect(self.screen, self.config.RED, (arena.food[0] * grid, arena.food[1] * grid, grid, grid))
+        power_up = arena.power_up
+        if power_up:
+            pygame.draw.rect(self.screen, power_up_color(self.config, power_up.type),
+                             (power_up.x * grid, power_up.y * grid, grid, grid))
+
+        for snake in arena.snakes:
+            head_color = ARENA_COLORS[snake.index % len(ARENA_COLORS)]
+            body_color = tuple(c // 2 for c in head_color)
+            segments = own_snake if own_snake is not None and snake.index == me else snake.snake
+            for i, segment in enumerate(segments):
+                pygame.draw.rect(self.screen, head_color if i == 0 else body_color,
+                                 (segment[0] * grid, segment[1] * grid, grid, grid))
+
+        for obs in arena.obstacles:
+            pygame.draw.rect(self.screen, self.config.PURPLE, (obs[0] * grid, obs[1] * grid, grid, grid))
+
+        # Scoreboard
+        panel_x = self.config.GAME_WIDTH + 10
+        panel_width = self.config.WIDTH - self.config.GAME_WIDTH - 20
+        pygame.draw.rect(self.screen, self.config.GRAY,
+                         (panel_x, 10, panel_width, self.config.GAME_HEIGHT - 20), border_radius=5)
+        for snake in arena.snakes:
+            name = self.arena_name(snake, me)
+            status = str(snake.score) if snake.alive else f"{snake.score} ({snake.death_cause})"
+            color = ARENA_COLORS[snake.index % len(ARENA_COLORS)] if snake.alive else self.config.WHITE
+            line = self.text.render(f"{name}: {status}", 30, color)
+            self.screen.blit(line, (panel_x + 20, 30 + snake.index * 34))
+
+        self.present()
@@ -0,0 +1,226 @@
+import os
+import struct
+
+# Level files for Ular yang Mengular.
+#
+# Levels are written as text (.lvl) and compiled into a binary file (.lvlc)
+# next to it the first time they are loaded, or whenever the text is newer.
+# Loading a compiled level is a header read plus one bitmap with a bit per
+# cell, and loaded levels are cached, so starting another game on the same
+# level costs nothing. However many rectangles or grid rows drew the walls,
+# they are flattened into a set of cells once at load time, so the engines
+# check a cell for a wall, or leave walls out of spawning, with one lookup.
+#
+# Text format, one setting per line, # starts a comment:
+#   name: Crossroads
+#   size: 44x32               board size in cells
+#   obstacles: 5              random obstacles added on top of the walls
+#   rect: 8 8 4 1             wall rectangle: column, row, width, height
+#   grid:                     the rest of the file is the board, row by row:
+#   ....#....                 # wall, S snake start, anything else is empty
+# A level needs a size or a grid. Without an S the snake starts in the middle.
+#
+# Compiled format (little endian):
+#   b"ULLV", version u8, cols u16, rows u16, start col i16, start row i16,
+#   random obstacles u16, name (u8 length + utf-8), walls bitmap: one bit per
+#   cell, row by row, lowest bit first
+
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+SOURCE_EXT = ".lvl"
+COMPILED_EXT = ".lvlc"
+
+MAGIC = b"ULLV"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHhhH")
+
+class CellBitmap:
+    """Grid cells of a fixed board marked with one byte per cell"""
+
+    def __init__(self, cols, rows, bits=None):
+        self.cols = cols
+        self.rows = rows
+        self.bits = bytearray(cols * rows) if bits is None else bits
+        self.count = sum(self.bits)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.bits[y * self.cols + x] == 1
+
+    def __iter__(self):
+        cols = self.cols
+        index = self.bits.find(1)
+        while index >= 0:
+            yield (index % cols, index // cols)
+            index = self.bits.find(1, index + 1)
+
+    def add(self, cell):
+        index = cell[1] * self.cols + cell[0]
+        if not self.bits[index]:
+            self.bits[index] = 1
+            self.count += 1
+
+    def pack(self):
+        # One bit per cell, lowest bit first
+        packed = bytearray((len(self.bits) + 7) // 8)
+        for index in range(len(self.bits)):
+            if self.bits[index]:
+                packed[index >> 3] |= 1 << (index & 7)
+        return packed
+
+    @classmethod
+    def unpack(cls, cols, rows, packed):
+        bits = bytearray(cols * rows)
+        for index in range(cols * rows):
+            if packed[index >> 3] >> (index & 7) & 1:
+                bits[index] = 1
+        return cls(cols, rows, bits)
+
+class Level:
+    """A board layout: its size, walls, snake start and extra random obstacles"""
+
+    def __init__(self, name, walls, start=None, obstacles=0):
+        self.name = name
+        self.cols = walls.cols
+        self.rows = walls.rows
+        self.walls = walls
+        # What the engines use, a set is their fastest cell lookup
+        self.wall_cells = frozenset(walls)
+        self.start = start if start is not None else (self.cols // 2, self.rows // 2)
+        self.obstacles = obstacles
+        if self.start in walls:
+            raise ValueError(f"level {name!r} starts the snake inside a wall at {self.start}")
+
+def parse_level(text, name="level"):
+    # Level from the text format, raises ValueError with the line at fault
+    size = None
+    rects = []
+    grid = None
+    start = None
+    obstacles = 0
+    for number, line in enumerate(text.splitlines(), 1):
+        if grid is not None:
+            line = line.rstrip()
+            if line:
+                grid.append(line)
+            continue
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        value = value.strip()
+        try:
+            if key == "name":
+                name = value
+            elif key == "size":
+                size = tuple(int(v) for v in value.lower().split("x"))
+            elif key == "obstacles":
+                obstacles = int(value)
+            elif key == "rect":
+                rects.append(tuple(int(v) for v in value.split()))
+            elif key == "grid":
+                grid = []
+            else:
+                raise ValueError(f"unknown setting {key!r}")
+        except ValueError as e:
+            raise ValueError(f"{name} line {number}: {e}") from None
+
+    if size is None:
+        if not grid:
+            raise ValueError(f"{name}: needs a size or a grid")
+        size = (max(len(row) for row in grid), len(grid))
+    cols, rows = size
+    walls = CellBitmap(cols, rows)
+    for x, y, w, h in rects:
+        for cy in range(max(y, 0), min(y + h, rows)):
+            for cx in range(max(x, 0), min(x + w, cols)):
+                walls.add((cx, cy))
+    for y, row in enumerate((grid or [])[:rows]):
+        for x, char in enumerate(row[:cols]):
+            if char == "#":
+                walls.add((x, y))
+            elif char == "S":
+                start = (x, y)
+    return Level(name, walls, start, obstacles)
+
+def write_compiled(level, path):
+    name = level.name.encode("utf-8")
+    data = bytearray(HEADER.pack(MAGIC, VERSION, level.cols, level.rows,
+                                 level.start[0], level.start[1], level.obstacles))
+    data.append(len(name))
+    data += name
+    data += level.walls.pack()
+    with open(path, "wb") as f:
+        f.write(data)
+
+def read_compiled(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, cols, rows, x, y, obstacles = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} compiled level")
+    pos = HEADER.size
+    length = data[pos]
+    name = data[pos + 1:pos + 1 + length].decode("utf-8")
+    pos += 1 + length
+    return Level(name, CellBitmap.unpack(cols, rows, data[pos:]), (x, y), obstacles)
+
+def level_path(name):
+    # A path to a .lvl/.lvlc file, or the name of one in LEVEL_DIR
+    if os.path.exists(name):
+        return name
+    return os.path.join(LEVEL_DIR, name + SOURCE_EXT)
+
+def compile_level(source, target=None):
+    # Compile a text level, returns the Level
+    target = target or os.path.splitext(source)[0] + COMPILED_EXT
+    with open(source, encoding="utf-8") as f:
+        level = parse_level(f.read(), os.path.splitext(os.path.basename(source))[0])
+    write_compiled(level, target)
+    return level
+
+# Levels loaded so far, by the name they were asked for
+loaded = {}
+
+def load_level(name):
+    # Cached Level for a name or path, compiling the text file when it has
+    # no compiled file yet or changed since
+    level = loaded.get(name)
+    if level is not None:
+        return level
+
+    path = level_path(name)
+    if path.endswith(COMPILED_EXT):
+        level = read_compiled(path)
+    else:
+        compiled = os.path.splitext(path)[0] + COMPILED_EXT
+        if os.path.exists(compiled) and (not os.path.exists(path) or
+                                         os.path.getmtime(compiled) >= os.path.getmtime(path)):
+            level = read_compiled(compiled)
+        else:
+            try:
+                level = compile_level(path, compiled)
+            except OSError:
+                # Read-only install, parse it every time instead
+                with open(path, encoding="utf-8") as f:
+                    level = parse_level(f.read(), os.path.splitext(os.path.basename(path))[0])
+    loaded[name] = level
+    return level
+
+def level_names():
+    # Levels shipped in LEVEL_DIR
+    if not os.path.isdir(LEVEL_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(LEVEL_DIR) if f.endswith(SOURCE_EXT))
+
+if __name__ == "__main__":
+    import sys
+
+    # Compile the given .lvl files, or every level in LEVEL_DIR
+    sources = sys.argv[1:] or [level_path(name) for name in level_names()]
+    for source in sources:
+        level = compile_level(source)
+        print(f"{source}: {level.name}, {level.cols}x{level.rows}, {len(level.walls)} wall cells")
@@ -0,0 +1,45 @@
+# Cell colors of Ular yang Mengular, shared by the pygame renderers and the
+# NumPy board raster. Plain Python so neither side pulls in the other's
+# dependencies.
+#
+# Every kind of cell has an index: 0..GRADIENT_LENGTH are the head and body
+# shades, past the gradient every segment takes the last one, then food, one
+# index per power-up type, obstacles and opponents. The atlas renderer keeps
+# one tile per index, BoardRaster stores the indexes as its cells.
+
+# Body shades run from 255 down in steps of 5, past this index every segment is black
+GRADIENT_LENGTH = 52
+FOOD = GRADIENT_LENGTH + 1
+POWER_UP = FOOD + 1
+# One index per power-up type, Speed Boost to Shrink Snake
+POWER_UP_TYPES = 5
+OBSTACLE = POWER_UP + POWER_UP_TYPES
+OPPONENT_HEAD = OBSTACLE + 1
+OPPONENT_BODY = OPPONENT_HEAD + 1
+COLOR_COUNT = OPPONENT_BODY + 1
+# Nothing on the cell, only the raster stores it
+EMPTY = 255
+
+def segment_color(config, index):
+    # Head in a different color, body segments have a gradient effect
+    if index == 0:
+        return config.GREEN
+    return (0, max(0, 255 - index * 5), 0)
+
+def power_up_color(config, type_id):
+    return config.YELLOW if type_id == 0 else \
+           config.PURPLE if type_id == 1 else \
+           config.BLUE
+
+def palette(config):
+    # 256 RGB colors for the indexes, the same colors draw_game uses
+    colors = [config.BLACK] * 256
+    for i in range(GRADIENT_LENGTH + 1):
+        colors[i] = segment_color(config, i)
+    colors[FOOD] = config.RED
+    for t in range(POWER_UP_TYPES):
+        colors[POWER_UP + t] = power_up_color(config, t)
+    colors[OBSTACLE] = config.PURPLE
+    colors[OPPONENT_HEAD] = config.ORANGE
+    colors[OPPONENT_BODY] = config.DARK_ORANGE
+    return colors
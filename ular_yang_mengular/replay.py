@@ -0,0 +1,199 @@
+import struct
+
+from .snake_engine import Config, SnakeEngine, DIRECTIONS, fit_board
+
+# Replay logs for Ular yang Mengular.
+#
+# A replay is everything needed to re-run a game through SnakeEngine: the RNG
+# seed, difficulty and rule settings, then one varint per direction change.
+# Layout (little endian):
+#   b"ULRP", version u8, seed u64, difficulty (u8 length + utf-8),
+#   cols u32, rows u32, obstacle count u32 (u16 each before version 5), tick rate f64,
+#   power-up chance f64, power-up duration f64, opponent count u16 (version 2),
+#   level (u8 length + utf-8, empty for none; version 4)
+#   events: varint (ticks since previous event << 2 | direction index)
+#   end:    varint 0, varint total ticks, varint score, flags u8 (done, won)
+# Events are written as they happen, so a game that crashed mid-way still
+# leaves a playable log, it just has no end record.
+# Version 3 has the same layout and marks logs recorded with tick-based,
+# stacking power-up effects; older logs that picked up a power-up may play
+# out differently under the current rules. Version 5 widened the board size
+# and obstacle count to fit huge boards.
+
+MAGIC = b"ULRP"
+VERSION = 5
+HEADER = struct.Struct("<4sBQ")
+SETTINGS = struct.Struct("<IIIddd")
+# Settings of version 1-4 logs
+SETTINGS_V4 = struct.Struct("<HHHddd")
+OPPONENTS = struct.Struct("<H")
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class Replay:
+    """A decoded replay log"""
+
+    def __init__(self, seed, difficulty, settings, events, end=None, opponents=0, level=None):
+        self.seed = seed
+        self.difficulty = difficulty
+        # cols, rows, obstacle count, tick rate, power-up chance, power-up duration
+        self.settings = settings
+        self.opponents = opponents
+        self.level = level
+        # {tick: direction}
+        self.events = events
+        # (ticks, score, done, won), None if the game never finished writing
+        self.end = end
+
+    def make_config(self, base=None):
+        config = base or Config()
+        cols, rows, obstacles, tick_rate, chance, duration = self.settings
+        fit_board(config, cols, rows)
+        config.OBSTACLE_COUNT = obstacles
+        config.DIFFICULTY_SPEEDS = dict(config.DIFFICULTY_SPEEDS, **{self.difficulty: tick_rate})
+        config.POWERUP_CHANCE = chance
+        config.POWERUP_DURATION = duration
+        config.OPPONENT_COUNT = self.opponents
+        config.LEVEL = self.level
+        return config
+
+    def make_engine(self, base=None):
+        return SnakeEngine(self.make_config(base), self.difficulty, self.seed)
+
+    def last_tick(self):
+        if self.end:
+            return self.end[0]
+        return max(self.events, default=0)
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, seed = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or not 1 <= version <= VERSION:
+        raise ValueError(f"{path} is not a version 1-{VERSION} replay")
+    pos = HEADER.size
+    length = data[pos]
+    difficulty = data[pos + 1:pos + 1 + length].decode("utf-8")
+    pos += 1 + length
+    layout = SETTINGS if version >= 5 else SETTINGS_V4
+    settings = layout.unpack_from(data, pos)
+    pos += layout.size
+    opponents = 0
+    if version >= 2:
+        opponents, = OPPONENTS.unpack_from(data, pos)
+        pos += OPPONENTS.size
+    level = None
+    if version >= 4:
+        length = data[pos]
+        level = data[pos + 1:pos + 1 + length].decode("utf-8") or None
+        pos += 1 + length
+
+    events = {}
+    tick = 0
+    end = None
+    while pos < len(data):
+        try:
+            value, pos = read_varint(data, pos)
+            if value == 0:
+                ticks, pos = read_varint(data, pos)
+                score, pos = read_varint(data, pos)
+                flags = data[pos]
+                end = (ticks, score, bool(flags & 1), bool(flags & 2))
+                break
+        except IndexError:
+            # Truncated by a crash, keep what was written
+            break
+        tick += value >> 2
+        events[tick] = DIRECTIONS[value & 3]
+    return Replay(seed, difficulty, settings, events, end, opponents, level)
+
+class ReplayRecorder:
+    """Streams a game's seed, settings and direction changes to a replay file"""
+
+    def __init__(self, path, engine):
+        self.path = path
+        self.engine = engine
+        self.last_event = 0
+        self.file = open(path, "wb")
+
+        config = engine.config
+        difficulty = engine.difficulty.encode("utf-8")
+        header = bytearray(HEADER.pack(MAGIC, VERSION, engine.seed))
+        header.append(len(difficulty))
+        header += difficulty
+        header += SETTINGS.pack(engine.cols, engine.rows, config.OBSTACLE_COUNT,
+                                config.DIFFICULTY_SPEEDS[engine.difficulty],
+                                config.POWERUP_CHANCE, config.POWERUP_DURATION)
+        header += OPPONENTS.pack(config.OPPONENT_COUNT)
+        level = (config.LEVEL or "").encode("utf-8")
+        header.append(len(level))
+        header += level
+        self.file.write(header)
+
+    def step(self, action=None):
+        # Step the engine and log the move if it actually changed direction
+        engine = self.engine
+        direction = engine.direction
+        state = engine.step(action)
+        if engine.direction != direction:
+            out = bytearray()
+            write_varint(out, (engine.ticks - self.last_event) << 2 | DIRECTIONS.index(engine.direction))
+            self.file.write(out)
+            # Flushed per event so a crash leaves everything up to that point
+            self.file.flush()
+            self.last_event = engine.ticks
+        if engine.done:
+            self.close()
+        return state
+
+    def close(self):
+        if self.file.closed:
+            return
+        engine = self.engine
+        if engine.done:
+            out = bytearray()
+            write_varint(out, 0)
+            write_varint(out, engine.ticks)
+            write_varint(out, engine.score)
+            out.append(int(engine.done) | int(engine.won) << 1)
+            self.file.write(out)
+        self.file.close()
+
+def simulate(replay, max_ticks=None):
+    # Re-run a replay headlessly as fast as possible, returns the engine at the end.
+    # A log without an end record stops after its last direction change.
+    engine = replay.make_engine()
+    if max_ticks is None:
+        max_ticks = replay.last_tick()
+    while not engine.done and engine.ticks < max_ticks:
+        engine.step(replay.events.get(engine.ticks + 1))
+    return engine
+
+def matches(replay, engine):
+    # True if a re-simulated engine ended exactly as the recorded game did
+    return replay.end == (engine.ticks, engine.score, engine.done, engine.won)
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        replay = load_replay(path)
+        engine = simulate(replay)
+        status = "no end record" if replay.end is None else "ok" if matches(replay, engine) else "MISMATCH"
+        print(f"{path}: {engine.ticks} ticks, score {engine.score}, {status}")
@@ -0,0 +1,151 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+# High score storage for Ular yang Mengular.
+# Every finished run is kept in a local SQLite database. Top-K queries, per
+# difficulty or per player, are answered from indexes so they stay fast
+# however many runs pile up, and each write is a single atomic transaction.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    difficulty TEXT,
+    timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, timestamp);
+CREATE INDEX IF NOT EXISTS scores_by_difficulty ON scores (difficulty, score DESC, timestamp);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC, timestamp);
+"""
+
+class ScoreStore:
+    """Append-only score history with indexed top-K queries"""
+
+    def __init__(self, path="high_scores.db", legacy_path="high_scores.json"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL keeps readers off the writer's back and commits are atomic:
+        # a crash mid-write loses that write, never the existing scores
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        if legacy_path:
+            self.import_legacy(legacy_path)
+
+    def import_legacy(self, legacy_path):
+        # Carry over the old top-5 JSON file the first time the database is created
+        if self.count() or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        self.add_many(entries)
+
+    def add(self, score, player="Player", difficulty=None, timestamp=None):
+        self.add_many([{"score": score, "player": player, "difficulty": difficulty, "timestamp": timestamp}])
+
+    def add_many(self, entries):
+        rows = [(entry["score"], entry.get("player") or "Player", entry.get("difficulty"),
+                 entry.get("timestamp") or int(time.time()))
+                for entry in entries]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO scores (score, player, difficulty, timestamp) VALUES (?, ?, ?, ?)", rows)
+
+    def top(self, k=5, difficulty=None, player=None):
+        # Each filter combination has an index that is already in score order
+        query = "SELECT score, player, difficulty, timestamp FROM scores"
+        conditions = []
+        params = []
+        if difficulty is not None:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        if player is not None:
+            conditions.append("player = ?")
+            params.append(player)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY score DESC, timestamp LIMIT ?"
+        params.append(k)
+        columns = ("score", "player", "difficulty", "timestamp")
+        return [dict(zip(columns, row)) for row in self.conn.execute(query, params)]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+class BackgroundWriter:
+    """Saves scores on a worker thread so the game loop never waits on disk"""
+
+    # After the first write of a burst, wait this long for more to batch with it
+    COALESCE_SECONDS = 0.05
+
+    def __init__(self, path="high_scores.db"):
+        self.path = path
+        self.queue = queue.Queue()
+        self.last_error = None
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="score-writer", daemon=True)
+        self.thread.start()
+        # Backstop for exits that skip close()
+        atexit.register(self.close)
+
+    def add(self, score, player="Player", difficulty=None, timestamp=None):
+        # Returns straight away, the write happens on the worker thread
+        self.queue.put({"score": score, "player": player, "difficulty": difficulty,
+                        "timestamp": timestamp or int(time.time())})
+
+    def run(self):
+        # SQLite connections belong to the thread that made them, so the worker
+        # opens its own. The schema and legacy import are done by the caller.
+        store = None
+        stopping = False
+        while not stopping:
+            entry = self.queue.get()
+            batch = []
+            while entry is not None:
+                batch.append(entry)
+                try:
+                    entry = self.queue.get(timeout=self.COALESCE_SECONDS)
+                except queue.Empty:
+                    break
+            else:
+                stopping = True
+
+            if batch:
+                try:
+                    if store is None:
+                        store = ScoreStore(self.path, legacy_path=None)
+                    store.add_many(batch)
+                except (sqlite3.Error, OSError) as e:
+                    # Reported to the game through last_error, the scores are lost
+                    self.last_error = e
+                    print(f"Could not save {len(batch)} score(s) to {self.path}: {e}", file=sys.stderr)
+            for _ in range(len(batch) + stopping):
+                self.queue.task_done()
+
+        if store is not None:
+            store.close()
+
+    def flush(self):
+        # Block until everything queued so far is on disk
+        self.queue.join()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
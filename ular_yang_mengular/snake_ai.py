@@ -0,0 +1,144 @@
+from collections import deque
+
+from .snake_engine import DIRECTIONS
+
+# Pathfinding for computer-controlled snakes.
+#
+# Every opponent heads for the same food, so one BFS distance field from the
+# food cell is shared by all of them. It only depends on the food and the
+# obstacles, so it is restarted when the food moves and reused on every other
+# tick, growing outwards only as far as the bots need. Snake bodies move every
+# tick and are left out of the field; they are checked when a bot picks among
+# its neighbouring cells, and a bounded flood fill keeps bots out of pockets
+# too small for them.
+
+UNREACHABLE = -1
+# Cells a distance field searches before falling back to straight-line
+# (Manhattan) distances, which keeps huge boards affordable
+SEARCH_LIMIT = 20000
+
+class DistanceField:
+    """BFS steps from every cell to one target, avoiding obstacles"""
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.target = None
+        self.obstacles = None
+        # Only cells the search has reached are stored, so a huge board costs
+        # no more than the area around the food and the bots
+        self.distances = {}
+        # BFS frontier still to expand
+        self.queue = deque()
+
+    def update(self, target, obstacles):
+        # Cached until the target or the obstacle set changes
+        if target == self.target and obstacles is self.obstacles:
+            return
+        self.target = target
+        self.obstacles = obstacles
+        self.distances = {}
+        self.queue = deque()
+        if target is not None:
+            self.distances[target] = 0
+            self.queue.append(target)
+
+    def get(self, cell):
+        # The BFS only runs as far out as the cells asked about so far, so a
+        # bot near the food does not pay for the far side of the board
+        distance = self.distances.get(cell)
+        if distance is None and self.queue:
+            self.expand(cell)
+            distance = self.distances.get(cell)
+            if distance is None and self.queue:
+                # Search limit reached, this far out just head the right way
+                return abs(cell[0] - self.target[0]) + abs(cell[1] - self.target[1])
+        return UNREACHABLE if distance is None else distance
+
+    def expand(self, goal):
+        cols = self.cols
+        rows = self.rows
+        distances = self.distances
+        obstacles = self.obstacles
+        queue = self.queue
+        while queue and goal not in distances and len(distances) < SEARCH_LIMIT:
+            cell = queue.popleft()
+            next_distance = distances[cell] + 1
+            for dx, dy in DIRECTIONS:
+                neighbour = (cell[0] + dx, cell[1] + dy)
+                if (0 <= neighbour[0] < cols and 0 <= neighbour[1] < rows
+                        and neighbour not in distances and neighbour not in obstacles):
+                    distances[neighbour] = next_distance
+                    queue.append(neighbour)
+
+class Planner:
+    """Chooses opponent moves from a shared food distance field"""
+
+    # Works with any engine that has cols, rows, food, obstacles, in_bounds()
+    # and cell_count(), so SnakeEngine opponents and arena bots share it
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.field = DistanceField(engine.cols, engine.rows)
+
+    def is_safe(self, cell, opponent):
+        engine = self.engine
+        if not engine.in_bounds(cell) or cell in engine.obstacles:
+            return False
+        count = engine.cell_count(cell)
+        if not count:
+            return True
+        # Its own tail moves out of the way unless it is about to grow
+        return count == 1 and cell == opponent.snake[-1] and cell != engine.food
+
+    def risk(self, cell, opponent):
+        # Extra danger of a safe cell, engines where snakes move at once override it
+        return 0
+
+    def open_area(self, start, opponent, limit):
+        # Cells reachable from start, counting no further than limit
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            x, y = queue.popleft()
+            for dx, dy in DIRECTIONS:
+                cell = (x + dx, y + dy)
+                if cell not in seen and self.is_safe(cell, opponent):
+                    seen.add(cell)
+                    queue.append(cell)
+        return len(seen)
+
+    def choose(self, opponent):
+        engine = self.engine
+        self.field.update(engine.food, engine.obstacles)
+        head = opponent.snake[0]
+        back = (-opponent.direction[0], -opponent.direction[1])
+
+        moves = []
+        for direction in DIRECTIONS:
+            if direction == back and len(opponent.snake) > 1:
+                continue
+            cell = (head[0] + direction[0], head[1] + direction[1])
+            if self.is_safe(cell, opponent):
+                distance = self.field.get(cell)
+                if distance == UNREACHABLE:
+                    distance = engine.cols * engine.rows
+                moves.append((self.risk(cell, opponent), distance, direction, cell))
+        if not moves:
+            # Boxed in, keep going and crash
+            return opponent.direction
+
+        # Least risky and closest to the food first, unless that leaves less
+        # room than the snake needs to keep moving; then go wherever there is most room
+        moves.sort(key=lambda move: move[:2])
+        need = len(opponent.snake) + 1
+        best_area = -1
+        fallback = moves[0][2]
+        for _, _, direction, cell in moves:
+            area = self.open_area(cell, opponent, need)
+            if area >= need:
+                return direction
+            if area > best_area:
+                best_area = area
+                fallback = direction
+        return fallback
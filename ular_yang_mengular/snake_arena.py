@@ -0,0 +1,279 @@
+import random
+from collections import deque
+
+from .effects import EffectScheduler
+from .snake_engine import (Config, FreeCells, PowerUp, DIRECTIONS, UP, DOWN, LEFT, RIGHT,
+                          SPEED_BOOST, DOUBLE_POINTS, SHIELD, SLOW_MOTION, SHRINK_SNAKE,
+                          effect_ticks, load_config_level, new_seed)
+from .snake_ai import Planner
+
+# Arena rules: N snakes on one board, all moving at the same time.
+#
+# Each tick every live snake picks its next cell first, then the moves are
+# resolved together. Tails that are not growing leave before anything moves
+# in, so a snake can follow another's tail. Two heads entering the same cell
+# both die, and a head entering any body dies. Bodies are tracked in one
+# occupancy hash and the heads of the tick in another, so a tick costs one
+# lookup per moving head however long the snakes are.
+#
+# Food and power-ups are shared. Double Points, Shield and Shrink Snake only
+# affect the snake that picked them up. Speed Boost and Slow Motion change
+# the arena clock, because every snake moves on the same tick. Effects run
+# on one tick scheduler, owned by the snake they affect or by nobody for the
+# clock, and stack like they do in SnakeEngine.
+
+class ArenaPlanner(Planner):
+    """Planner that also keeps bots out of reach of other heads"""
+
+    def risk(self, cell, snake):
+        # Another head next to the cell could move into it this same tick
+        heads = self.engine.heads
+        for dx, dy in DIRECTIONS:
+            other = heads.get((cell[0] + dx, cell[1] + dy))
+            if other is not None and other is not snake:
+                return 1
+        return 0
+
+class ArenaSnake:
+    """One snake in an ArenaEngine, steered by actions or by the planner"""
+
+    def __init__(self, index, bot=False):
+        self.index = index
+        self.bot = bot
+        self.snake = deque()
+        self.direction = RIGHT
+        # Cell it is moving into this tick
+        self.target = None
+        self.alive = True
+        self.score = 0
+        self.growth_factor = 1
+        # "wall", "self", "obstacle", "opponent" or "head-on" once it dies
+        self.death_cause = None
+
+class ArenaEngine:
+    """N snakes on one board, all moving at once each tick"""
+
+    def __init__(self, config=None, difficulty="Medium", seed=None, humans=1, bots=3):
+        self.config = config or Config()
+        self.cols = self.config.GAME_WIDTH // self.config.GRID_SIZE
+        self.rows = self.config.GAME_HEIGHT // self.config.GRID_SIZE
+        self.difficulty = difficulty
+        self.humans = humans
+        self.bots = bots
+        # Level walls, the snakes start anywhere off them
+        self.level = load_config_level(self.config, self.cols, self.rows)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        walls = self.level.wall_cells if self.level else frozenset()
+        self.free = FreeCells((x, y) for y in range(self.rows) for x in range(self.cols) if (x, y) not in walls)
+        # Segments per cell across all snakes
+        self.occupied = {}
+        self.obstacles = set(walls)
+        self.food = None
+        self.power_up = None
+        self.effects = EffectScheduler()
+        self.speed_multiplier = 1.0
+        self.ticks = 0
+        self.done = False
+        self.winner = None
+
+        self.snakes = [ArenaSnake(i, bot=i >= self.humans) for i in range(self.humans + self.bots)]
+        for snake in self.snakes:
+            cell = self.free.choice(self.rng)
+            snake.snake.append(cell)
+            self.occupy(cell)
+            # Start off heading for the middle, away from the nearest walls
+            dx = self.cols // 2 - cell[0]
+            dy = self.rows // 2 - cell[1]
+            if abs(dx) >= abs(dy):
+                snake.direction = RIGHT if dx >= 0 else LEFT
+            else:
+                snake.direction = DOWN if dy > 0 else UP
+        self.food = self.spawn()
+        self.obstacles = set(walls)
+        for _ in range(self.config.OBSTACLE_COUNT):
+            cell = self.spawn()
+            if cell is None:
+                break
+            self.obstacles.add(cell)
+        self.planner = ArenaPlanner(self)
+        # Head cell of every live snake, for the planner's head-on check
+        self.heads = {}
+
+    def tick_rate(self):
+        return self.config.DIFFICULTY_SPEEDS[self.difficulty] * self.speed_multiplier
+
+    def spawn(self):
+        cell = self.free.choice(self.rng)
+        if cell is not None:
+            self.free.discard(cell)
+        return cell
+
+    def step(self, actions=None):
+        # actions holds a direction (or None to go straight) per snake index,
+        # bots ignore theirs and follow the planner
+        if self.done:
+            return
+        self.ticks += 1
+        if self.effects.advance():
+            self.update_effects()
+
+        # Everybody decides before anybody moves
+        moving = [snake for snake in self.snakes if snake.alive]
+        self.heads = {snake.snake[0]: snake for snake in moving}
+        targets = {}
+        for snake in moving:
+            if snake.bot:
+                snake.direction = self.planner.choose(snake)
+            elif actions:
+                self.turn(snake, actions[snake.index] if snake.index < len(actions) else None)
+            head = snake.snake[0]
+            target = (head[0] + snake.direction[0], head[1] + snake.direction[1])
+            if not self.in_bounds(target) and self.effects.count(SHIELD, snake.index):
+                # Shield lets it pass through the wall once
+                target = (target[0] % self.cols, target[1] % self.rows)
+                self.consume_shield(snake)
+            snake.target = target
+            targets.setdefault(target, []).append(snake)
+
+        # Two snakes moving into each other's heads meet head-on as well. They
+        # would otherwise swap cells, since the tails are gone before collisions
+        # are checked and every snake starts out with its head as its tail.
+        swapped = set()
+        for snake in moving:
+            other = self.heads.get(snake.target)
+            if other is not None and other is not snake and other.target == snake.snake[0]:
+                swapped.add(snake)
+
+        # Tails leave first unless their snake is about to grow
+        for snake in moving:
+            if snake.target != self.food:
+                self.vacate(snake.snake.pop())
+
+        dead = []
+        for cell, group in targets.items():
+            if len(group) > 1 or group[0] in swapped:
+                for snake in group:
+                    snake.death_cause = "head-on"
+                dead.extend(group)
+                continue
+            snake = group[0]
+            cause = self.collision(snake, cell)
+            if cause and not self.shielded(snake):
+                snake.death_cause = cause
+                dead.append(snake)
+
+        for snake in dead:
+            # A snake that grew this tick kept its tail, it goes with the rest
+            snake.alive = False
+            while snake.snake:
+                self.vacate(snake.snake.pop())
+
+        ate = False
+        for snake in moving:
+            if not snake.alive:
+                continue
+            snake.snake.appendleft(snake.target)
+            self.occupy(snake.target)
+            if snake.target == self.food:
+                snake.score += snake.growth_factor
+                ate = True
+            power_up = self.power_up
+            if power_up and snake.target == (power_up.x, power_up.y):
+                self.power_up = None
+                self.apply_power_up(snake, power_up.type)
+
+        if ate:
+            self.food = self.spawn()
+            # One power-up on the board at a time
+            if self.power_up is None:
+                self.spawn_power_up()
+
+        alive = [snake for snake in self.snakes if snake.alive]
+        humans_left = any(not snake.bot for snake in alive)
+        if self.food is None or len(alive) < min(2, len(self.snakes)) or (self.humans and not humans_left):
+            self.done = True
+            if len(alive) == 1:
+                self.winner = alive[0]
+
+    def turn(self, snake, direction):
+        # Sideways only, like SnakeEngine.turn
+        if direction is None:
+            return
+        if direction[0] == 0 and snake.direction[1] == 0:
+            snake.direction = direction
+        elif direction[1] == 0 and snake.direction[0] == 0:
+            snake.direction = direction
+
+    def collision(self, snake, cell):
+        if not self.in_bounds(cell):
+            return "wall"
+        if cell in self.obstacles:
+            return "obstacle"
+        if self.occupied.get(cell):
+            return "self" if cell in snake.snake else "opponent"
+        return None
+
+    def shielded(self, snake):
+        if not self.effects.count(SHIELD, snake.index):
+            return False
+        self.consume_shield(snake)
+        return True
+
+    def spawn_power_up(self):
+        if self.rng.random() < self.config.POWERUP_CHANCE:
+            cell = self.spawn()
+            if cell is not None:
+                self.power_up = PowerUp(cell[0], cell[1], self.rng.randint(SPEED_BOOST, SHRINK_SNAKE))
+
+    def apply_power_up(self, snake, power_up_type):
+        if power_up_type == SHRINK_SNAKE:
+            keep = len(snake.snake) - 3 if len(snake.snake) > 4 else 1
+            while len(snake.snake) > keep:
+                self.vacate(snake.snake.pop())
+            return
+        # The clock belongs to everybody, the rest to the snake that picked it up
+        owner = None if power_up_type in (SPEED_BOOST, SLOW_MOTION) else snake.index
+        self.effects.schedule(power_up_type, effect_ticks(self.config, self.difficulty), owner)
+        self.update_effects()
+
+    def update_effects(self):
+        effects = self.effects
+        self.speed_multiplier = 1.5 ** effects.count(SPEED_BOOST) * 0.5 ** effects.count(SLOW_MOTION)
+        for snake in self.snakes:
+            snake.growth_factor = 2 ** effects.count(DOUBLE_POINTS, snake.index)
+
+    def active_effects(self, snake=None):
+        # [(power-up type, stacks, ticks left)] running for a snake, or on the clock without one
+        return self.effects.active(None if snake is None else snake.index)
+
+    def consume_shield(self, snake):
+        self.effects.cancel(self.effects.first(SHIELD, snake.index))
+
+    def occupy(self, cell):
+        self.occupied[cell] = self.occupied.get(cell, 0) + 1
+        self.free.discard(cell)
+
+    def vacate(self, cell):
+        count = self.occupied[cell] - 1
+        if count:
+            self.occupied[cell] = count
+            return
+        del self.occupied[cell]
+        if not self.in_bounds(cell) or cell in self.obstacles or cell == self.food:
+            return
+        if self.power_up and cell == (self.power_up.x, self.power_up.y):
+            return
+        self.free.add(cell)
+
+    def cell_count(self, cell):
+        return self.occupied.get(cell, 0)
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows
@@ -0,0 +1,690 @@
+import hashlib
+import os
+import random
+from collections import deque
+
+from .effects import EffectScheduler
+
+# Headless rules for Ular yang Mengular.
+# Everything in here is plain Python so games can be stepped without pygame;
+# the pygame front end in game.py only renders this state.
+
+# Directions in grid cells
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Power-up types
+SPEED_BOOST = 0
+DOUBLE_POINTS = 1
+SHIELD = 2
+SLOW_MOTION = 3
+SHRINK_SNAKE = 4
+POWER_UP_NAMES = ["Speed Boost", "Double Points", "Shield", "Slow Motion", "Shrink Snake"]
+
+# Game Configuration
+class Config:
+    def __init__(self):
+        # Optimized for 1920x1200 resolution
+        self.WIDTH = 1400
+        self.HEIGHT = 900
+        self.GAME_WIDTH = 1100
+        self.GAME_HEIGHT = 800
+        self.GRID_SIZE = 25
+        self.FPS = 10
+        self.DIFFICULTY_SPEEDS = {
+            "Easy": 8,
+            "Medium": 12,
+            "Hard": 16
+        }
+        # Colors
+        self.BLACK = (0, 0, 0)
+        self.WHITE = (255, 255, 255)
+        self.RED = (255, 0, 0)
+        self.GREEN = (0, 255, 0)
+        self.BLUE = (0, 0, 255)
+        self.YELLOW = (255, 255, 0)
+        self.PURPLE = (128, 0, 128)
+        self.GRAY = (100, 100, 100)
+        self.ORANGE = (255, 140, 0)
+        self.DARK_ORANGE = (170, 85, 0)
+        # Power-up settings
+        self.POWERUP_CHANCE = 0.1  # 10% chance of spawning a power-up when food is eaten
+        self.POWERUP_DURATION = 5  # 5 seconds at the difficulty's normal speed
+        # Obstacles spawned at the start of every game
+        self.OBSTACLE_COUNT = 10
+        # "full" redraws the whole screen every frame, "dirty" blits a cached
+        # background and updates only the cells that changed, "atlas" draws
+        # every cell as a tile of a pre-built atlas in a few blit batches,
+        # "raster" scales up a NumPy grid of the cells in one go (needs numpy)
+        self.RENDER_MODE = "full"
+        # Rendering and input run at this rate, the simulation keeps ticking at
+        # the difficulty speed and the snake is interpolated in between
+        self.RENDER_FPS = 60
+        self.INTERPOLATE = True
+        # Most catch-up ticks run in one frame after a stall
+        self.MAX_TICKS_PER_FRAME = 5
+        # Directory to save a replay of every game into, None to not record
+        self.REPLAY_DIR = None
+        # SQLite database every finished run is saved to
+        self.SCORE_DB = "high_scores.db"
+        # Computer-controlled snakes sharing the board, and how many ticks a
+        # crashed one stays off the board before it respawns
+        self.OPPONENT_COUNT = 0
+        self.OPPONENT_RESPAWN_TICKS = 30
+        # Board size in cells when it should not just fill the game area, e.g.
+        # 10000 x 10000. Boards bigger than the game area are shown through a
+        # camera that follows the head.
+        self.BOARD_COLS = None
+        self.BOARD_ROWS = None
+        # Boards with more cells than this, and every board shown through the
+        # camera, keep no free-cell index and spawn by picking random cells
+        # until an empty one turns up
+        self.SPARSE_CELLS = 1000000
+        # Side in cells of the chunks huge boards are bucketed into
+        self.CHUNK_SIZE = 64
+        # Level to play, a name from levels/ or a path to a .lvl/.lvlc file.
+        # OBSTACLE_COUNT random obstacles are still added on top of its walls.
+        self.LEVEL = None
+
+# A power-up waiting on the board, picking it up starts a timed effect
+class PowerUp:
+    def __init__(self, x, y, type_id):
+        self.x = x
+        self.y = y
+        self.type = type_id
+
+def effect_ticks(config, difficulty):
+    # POWERUP_DURATION in ticks at the difficulty's normal speed
+    return round(config.POWERUP_DURATION * config.DIFFICULTY_SPEEDS[difficulty])
+
+def new_seed():
+    # A fresh 64-bit seed for games started without one
+    return int.from_bytes(os.urandom(8), "little")
+
+def derive_seed(seed, *keys):
+    # 64-bit seed of the stream named by keys under seed, e.g. game 7 of a run.
+    # Hashing the name instead of drawing seeds from a parent generator keeps
+    # sibling streams independent of each other, and any one of them can be
+    # rebuilt from seed and keys alone, whichever order workers ask for them.
+    data = repr((seed,) + keys).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def spawn_seeds(seed, n, *keys):
+    # Seeds of n independent streams, one per game or worker
+    return [derive_seed(seed, *keys, i) for i in range(n)]
+
+# Random picks before a sparse board falls back to searching chunk by chunk
+SPARSE_TRIES = 1000
+
+def board_size(config):
+    # (cols, rows) of the board described by a Config
+    return (config.BOARD_COLS or config.GAME_WIDTH // config.GRID_SIZE,
+            config.BOARD_ROWS or config.GAME_HEIGHT // config.GRID_SIZE)
+
+def uses_camera(config):
+    # Boards bigger than the game area are drawn through the camera
+    cols, rows = board_size(config)
+    return cols * config.GRID_SIZE > config.GAME_WIDTH or rows * config.GRID_SIZE > config.GAME_HEIGHT
+
+def fit_board(config, cols, rows):
+    # Size a Config for a cols x rows board: boards that fit on screen shrink
+    # the game area to match, bigger ones are played through the camera
+    if cols * config.GRID_SIZE <= config.GAME_WIDTH and rows * config.GRID_SIZE <= config.GAME_HEIGHT:
+        config.GAME_WIDTH = cols * config.GRID_SIZE
+        config.GAME_HEIGHT = rows * config.GRID_SIZE
+        config.BOARD_COLS = config.BOARD_ROWS = None
+    else:
+        config.BOARD_COLS = cols
+        config.BOARD_ROWS = rows
+    return config
+
+def load_config_level(config, cols, rows):
+    # The Level named by config.LEVEL, None without one. Levels are only
+    # imported when used, like the opponent planner.
+    if not config.LEVEL:
+        return None
+    from .levels import load_level
+    level = load_level(config.LEVEL)
+    if (level.cols, level.rows) != (cols, rows):
+        raise ValueError(f"level {level.name!r} is {level.cols}x{level.rows}, the board is {cols}x{rows}")
+    return level
+
+class Opponent:
+    """A computer-controlled snake, moved by SnakeEngine.step_opponents"""
+
+    def __init__(self, index):
+        self.index = index
+        self.snake = deque()
+        self.direction = RIGHT
+        self.alive = False
+        self.score = 0
+        # Tick at which a crashed opponent comes back
+        self.respawn_tick = 0
+
+class FreeCells:
+    """Set of grid cells with O(1) add, discard and uniform random choice"""
+
+    def __init__(self, cells=()):
+        # Cells live in a list for random picks, index maps each cell to its slot
+        self.cells = []
+        self.index = {}
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        slot = self.index.pop(cell, None)
+        if slot is None:
+            return
+        # Fill the hole with the last cell so the list stays packed
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.index[last] = slot
+
+    def choice(self, rng):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+class ChunkGrid:
+    """Set of grid cells bucketed into square chunks, only occupied chunks exist"""
+
+    def __init__(self, chunk_size=64, cells=()):
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.count = 0
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        chunk = self.chunks.get((cell[0] // self.chunk_size, cell[1] // self.chunk_size))
+        return chunk is not None and cell in chunk
+
+    def __iter__(self):
+        for chunk in self.chunks.values():
+            yield from chunk
+
+    def add(self, cell):
+        key = (cell[0] // self.chunk_size, cell[1] // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = set()
+        if cell not in chunk:
+            chunk.add(cell)
+            self.count += 1
+
+    def discard(self, cell):
+        key = (cell[0] // self.chunk_size, cell[1] // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None or cell not in chunk:
+            return
+        chunk.remove(cell)
+        self.count -= 1
+        if not chunk:
+            del self.chunks[key]
+
+    def cells_in(self, x0, y0, x1, y1):
+        # Cells with x0 <= x < x1 and y0 <= y < y1, only visiting the chunks
+        # that overlap the area, so the cost follows the area and not the board
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is None:
+                    continue
+                inside = (cx * size >= x0 and (cx + 1) * size <= x1 and
+                          cy * size >= y0 and (cy + 1) * size <= y1)
+                for cell in chunk:
+                    if inside or (x0 <= cell[0] < x1 and y0 <= cell[1] < y1):
+                        yield cell
+
+class SnakeEngine:
+    """Pure-Python snake rules, stepped one tick at a time"""
+
+    def __init__(self, config=None, difficulty="Medium", seed=None):
+        self.config = config or Config()
+        self.cols, self.rows = board_size(self.config)
+        # Huge boards: no free-cell index, obstacles and body bucketed into
+        # chunks. Any board the camera shows counts, so the camera only ever
+        # visits the chunks in view and a reset never walks every cell.
+        self.sparse = uses_camera(self.config) or self.cols * self.rows > self.config.SPARSE_CELLS
+        self.difficulty = difficulty
+        self.level = load_config_level(self.config, self.cols, self.rows)
+        # Renderers that redraw only what changed set this to a set(); the
+        # engine then records every cell whose contents changed
+        self.dirty = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        # Every game draws from its own RNG, so a seed plus the moves made
+        # reproduces it exactly. Without a seed each game gets a fresh one.
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Snake initialization, positions are (column, row) grid cells.
+        # body_counts is the occupancy index for the snake: it is updated as
+        # the head moves and the tail pops so collision checks never scan it.
+        # free holds every cell without snake, obstacle, food or power-up, so
+        # spawning is a single random pick however full the board is.
+        # Sparse boards are nearly all empty, so they spawn by random picks
+        # instead and keep a chunked copy of the body for the camera renderer.
+        if self.sparse:
+            self.free = None
+            self.body_chunks = ChunkGrid(self.config.CHUNK_SIZE)
+        else:
+            walls = self.level.wall_cells if self.level else ()
+            self.free = FreeCells((x, y) for y in range(self.rows) for x in range(self.cols)
+                                  if (x, y) not in walls)
+            self.body_chunks = None
+        self.snake = deque()
+        self.body_counts = {}
+        # Opponent bodies get their own occupancy index, so the player's
+        # self-collision check never has to tell whose segment it hit
+        self.opponent_cells = {}
+        self.opponents = []
+        self.add_head(self.level.start if self.level else (self.cols // 2, self.rows // 2))
+        # Where the head and tail were before the last step, for interpolated drawing
+        self.prev_head = self.snake[0]
+        self.prev_tail = self.snake[-1]
+        self.direction = RIGHT
+        self.score = 0
+        self.done = False
+        self.won = False
+        # "wall", "self", "obstacle" or "opponent" once a collision ends the game
+        self.death_cause = None
+
+        # Power-up effects run on ticks, so they last the same however fast
+        # the engine is driven and stop counting down while it is not stepped
+        self.ticks = 0
+        self.effects = EffectScheduler()
+
+        # Food and power-ups
+        self.power_up = None
+        self.food = None
+        self.obstacles = self.new_cell_set(self.level.wall_cells if self.level else ())
+        self.food = self.spawn_food()
+
+        # Obstacles
+        self.obstacles = self.spawn_obstacles(self.config.OBSTACLE_COUNT)
+
+        # Opponents, steered by snake_ai from a distance field shared by all of them
+        self.planner = None
+        if self.config.OPPONENT_COUNT:
+            from .snake_ai import Planner
+            self.planner = Planner(self)
+            for i in range(self.config.OPPONENT_COUNT):
+                opponent = Opponent(i)
+                self.opponents.append(opponent)
+                self.spawn_opponent(opponent)
+
+        # Game options
+        self.speed_multiplier = 1.0
+        self.growth_factor = 1
+        return self.get_state()
+
+    def get_state(self):
+        # The containers are the engine's own, callers must treat them as read-only
+        return {
+            "snake": self.snake,
+            "food": self.food,
+            "power_up": self.power_up,
+            "effects": self.effects.active(),
+            "obstacles": self.obstacles,
+            "score": self.score,
+            "ticks": self.ticks,
+            "done": self.done,
+            "won": self.won,
+            "death_cause": self.death_cause,
+        }
+
+    def tick_rate(self):
+        # Ticks per second for the current difficulty and power-ups
+        return self.config.DIFFICULTY_SPEEDS[self.difficulty] * self.speed_multiplier
+
+    def turn(self, direction):
+        # The snake can only turn sideways, never straight back into itself
+        if direction is None:
+            return
+        if direction[0] == 0 and self.direction[1] == 0:
+            self.direction = direction
+        elif direction[1] == 0 and self.direction[0] == 0:
+            self.direction = direction
+
+    def step(self, action=None):
+        if self.done:
+            return self.get_state()
+
+        self.turn(action)
+        self.ticks += 1
+        self.prev_head = self.snake[0]
+        self.prev_tail = self.snake[-1]
+
+        # End the power-up effects that run out this tick
+        if self.effects.advance():
+            self.update_effects()
+
+        # Move the snake
+        new_head = self.move_snake()
+
+        # Check if snake eats food
+        if new_head == self.food:
+            self.score += 1 * self.growth_factor
+            self.food = self.spawn_food()
+            if self.food is None:
+                # Nowhere left to put food, the snake has filled the board
+                self.won = True
+                self.done = True
+                return self.get_state()
+
+            # Potentially spawn a power-up, one on the board at a time
+            if self.power_up is None:
+                self.power_up = self.spawn_power_up()
+        else:
+            # Only remove the tail if no food was eaten
+            self.remove_tail()
+
+        # Check if snake gets power-up
+        if self.power_up and new_head == (self.power_up.x, self.power_up.y):
+            power_up_type = self.power_up.type
+            self.power_up = None
+            self.apply_power_up(power_up_type)
+
+        # Check for collisions
+        if self.check_collision():
+            self.done = True
+            return self.get_state()
+
+        if self.opponents:
+            self.step_opponents()
+
+        return self.get_state()
+
+    def new_cell_set(self, cells=()):
+        return ChunkGrid(self.config.CHUNK_SIZE, cells) if self.sparse else set(cells)
+
+    def take_free_cell(self):
+        # Random empty cell, taken out of the free index. None when the board is full.
+        if self.free is not None:
+            cell = self.free.choice(self.rng)
+            if cell is not None:
+                self.free.discard(cell)
+            return cell
+        for _ in range(SPARSE_TRIES):
+            cell = (self.rng.randrange(self.cols), self.rng.randrange(self.rows))
+            if not self.is_occupied(cell):
+                return cell
+        return self.scan_free_cell()
+
+    def scan_free_cell(self):
+        # Sparse boards where random picks keep missing: visit the chunks in
+        # random order, skip those that obstacles and body fill completely and
+        # take a random empty cell of the first one that has any. Only returns
+        # None when no cell on the board is empty.
+        size = self.config.CHUNK_SIZE
+        chunks = [(cx, cy) for cy in range(-(-self.rows // size)) for cx in range(-(-self.cols // size))]
+        self.rng.shuffle(chunks)
+        for cx, cy in chunks:
+            x0 = cx * size
+            y0 = cy * size
+            x1 = min(x0 + size, self.cols)
+            y1 = min(y0 + size, self.rows)
+            obstacles = self.obstacles.chunks.get((cx, cy), ())
+            body = self.body_chunks.chunks.get((cx, cy), ())
+            taken = len(obstacles) + sum(1 for cell in body if cell not in obstacles)
+            if taken >= (x1 - x0) * (y1 - y0):
+                continue
+            cells = [(x, y) for y in range(y0, y1) for x in range(x0, x1) if not self.is_occupied((x, y))]
+            if cells:
+                return cells[self.rng.randrange(len(cells))]
+        return None
+
+    def is_occupied(self, cell):
+        if cell in self.body_counts or cell in self.opponent_cells or cell in self.obstacles:
+            return True
+        if cell == self.food:
+            return True
+        return self.power_up is not None and cell == (self.power_up.x, self.power_up.y)
+
+    def spawn_food(self):
+        # Returns None when the board is full
+        cell = self.take_free_cell()
+        if cell is not None:
+            self.mark(cell)
+        return cell
+
+    def spawn_power_up(self):
+        if self.rng.random() < self.config.POWERUP_CHANCE:
+            cell = self.take_free_cell()
+            if cell is not None:
+                self.mark(cell)
+                power_up_type = self.rng.randint(SPEED_BOOST, SHRINK_SNAKE)
+                return PowerUp(cell[0], cell[1], power_up_type)
+        return None
+
+    def spawn_obstacles(self, count=10):
+        # The level's walls, if any, plus count random obstacles
+        obstacles = self.new_cell_set(self.level.wall_cells if self.level else ())
+        # In place already, so sparse boards see the obstacles placed so far as taken
+        self.obstacles = obstacles
+        count += len(obstacles)
+        while len(obstacles) < count:
+            # Avoid snake, food, power-up
+            cell = self.take_free_cell()
+            if cell is None:
+                break
+            obstacles.add(cell)
+        return obstacles
+
+    def spawn_opponent(self, opponent):
+        cell = self.take_free_cell()
+        if cell is None:
+            # Board is full, try again later
+            opponent.respawn_tick = self.ticks + self.config.OPPONENT_RESPAWN_TICKS
+            return
+        opponent.snake = deque()
+        self.add_opponent_head(opponent, cell)
+        opponent.direction = DIRECTIONS[self.rng.randrange(len(DIRECTIONS))]
+        opponent.alive = True
+
+    def step_opponents(self):
+        # Opponents move after the player, one at a time in index order
+        if self.food is None:
+            self.food = self.spawn_food()
+        for opponent in self.opponents:
+            if not opponent.alive:
+                if self.ticks >= opponent.respawn_tick:
+                    self.spawn_opponent(opponent)
+                continue
+
+            opponent.direction = self.planner.choose(opponent)
+            head = opponent.snake[0]
+            new_head = (head[0] + opponent.direction[0], head[1] + opponent.direction[1])
+            eats = new_head == self.food
+            if not eats:
+                self.vacate_opponent(opponent.snake.pop())
+
+            # Walls, obstacles and every body on the board are fatal, the
+            # player's head included
+            if (not self.in_bounds(new_head) or new_head in self.obstacles
+                    or new_head in self.body_counts or new_head in self.opponent_cells):
+                self.kill_opponent(opponent)
+                continue
+
+            self.add_opponent_head(opponent, new_head)
+            if eats:
+                opponent.score += 1
+                # None when the board is full, step_opponents retries next tick
+                self.food = self.spawn_food()
+
+    def kill_opponent(self, opponent):
+        while opponent.snake:
+            self.vacate_opponent(opponent.snake.pop())
+        opponent.alive = False
+        opponent.respawn_tick = self.ticks + self.config.OPPONENT_RESPAWN_TICKS
+
+    def add_opponent_head(self, opponent, cell):
+        opponent.snake.appendleft(cell)
+        self.opponent_cells[cell] = self.opponent_cells.get(cell, 0) + 1
+        if self.free is not None:
+            self.free.discard(cell)
+        self.mark(cell)
+
+    def vacate_opponent(self, cell):
+        self.mark(cell)
+        count = self.opponent_cells[cell] - 1
+        if count:
+            self.opponent_cells[cell] = count
+            return
+        del self.opponent_cells[cell]
+        self.release(cell)
+
+    def apply_power_up(self, power_up_type):
+        if power_up_type == SHRINK_SNAKE:
+            # Instant: remove 3 segments if possible, but leave at least the head
+            keep = len(self.snake) - 3 if len(self.snake) > 4 else 1
+            while len(self.snake) > keep:
+                self.remove_tail()
+            return
+
+        # Everything else is timed, and picking up another of the same kind
+        # stacks on top of the ones still running
+        self.effects.schedule(power_up_type, effect_ticks(self.config, self.difficulty))
+        self.update_effects()
+
+    def update_effects(self):
+        # Recompute the modifiers from the effects still running
+        effects = self.effects
+        self.speed_multiplier = 1.5 ** effects.count(SPEED_BOOST) * 0.5 ** effects.count(SLOW_MOTION)
+        self.growth_factor = 2 ** effects.count(DOUBLE_POINTS)
+
+    def active_effects(self):
+        # [(power-up type, stacks, ticks left)] of the running effects
+        return self.effects.active()
+
+    def has_shield(self):
+        return self.effects.count(SHIELD) > 0
+
+    def consume_shield(self):
+        # Each stacked shield saves the snake once, the one closest to running out goes first
+        self.effects.cancel(self.effects.first(SHIELD))
+
+    def mark(self, cell):
+        if self.dirty is not None:
+            self.dirty.add(cell)
+
+    def occupy(self, cell):
+        count = self.body_counts.get(cell, 0)
+        self.body_counts[cell] = count + 1
+        if self.free is not None:
+            self.free.discard(cell)
+        elif not count:
+            self.body_chunks.add(cell)
+        self.mark(cell)
+
+    def vacate(self, cell):
+        self.mark(cell)
+        count = self.body_counts[cell] - 1
+        if count:
+            self.body_counts[cell] = count
+            return
+        del self.body_counts[cell]
+        if self.body_chunks is not None:
+            self.body_chunks.discard(cell)
+        self.release(cell)
+
+    def release(self, cell):
+        # Only hand the cell back if nothing else is sitting on it
+        if self.free is None:
+            return
+        if not self.in_bounds(cell) or cell in self.obstacles or cell == self.food:
+            return
+        if cell in self.body_counts or cell in self.opponent_cells:
+            return
+        if self.power_up and cell == (self.power_up.x, self.power_up.y):
+            return
+        self.free.add(cell)
+
+    def cell_count(self, cell):
+        # Snake segments on a cell, the player's and the opponents'
+        return self.body_counts.get(cell, 0) + self.opponent_cells.get(cell, 0)
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows
+
+    def add_head(self, cell):
+        self.snake.appendleft(cell)
+        self.occupy(cell)
+
+    def remove_tail(self):
+        cell = self.snake.pop()
+        self.vacate(cell)
+        return cell
+
+    def replace_head(self, cell):
+        self.vacate(self.snake[0])
+        self.snake[0] = cell
+        self.occupy(cell)
+
+    def move_snake(self):
+        new_head = (self.snake[0][0] + self.direction[0], self.snake[0][1] + self.direction[1])
+        self.add_head(new_head)
+        return new_head
+
+    def check_collision(self):
+        x, y = self.snake[0]
+
+        # Check if snake hits the boundary
+        if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+            # Shield power-up lets you pass through walls once
+            if self.has_shield():
+                # Wrap around to the other side
+                self.replace_head((x % self.cols, y % self.rows))
+                self.consume_shield()
+                return False
+            self.death_cause = "wall"
+            return True
+
+        # Check if snake hits itself, the head counts once so any more is a body segment
+        if self.body_counts[self.snake[0]] > 1:
+            if self.has_shield():  # Shield protects from self-collision too
+                self.consume_shield()
+                return False
+            self.death_cause = "self"
+            return True
+
+        # Check if snake runs into an opponent
+        if self.snake[0] in self.opponent_cells:
+            if self.has_shield():
+                self.consume_shield()
+                return False
+            self.death_cause = "opponent"
+            return True
+
+        # Check if snake hits an obstacle
+        if self.snake[0] in self.obstacles:
+            if self.has_shield():  # Shield protects from obstacles too
+                self.consume_shield()
+                return False
+            self.death_cause = "obstacle"
+            return True
+
+        return False
@@ -0,0 +1,234 @@
+import os
+
+from .snake_engine import Config, SnakeEngine, DIRECTIONS, derive_seed, new_seed, spawn_seeds
+
+# Agent interface for Ular yang Mengular.
+# SnakeEnv wraps SnakeEngine in the usual reset()/step(action) loop, and
+# VectorEnv runs many of them across worker processes that write their
+# observations straight into one shared-memory buffer.
+#
+# Actions are indexes into DIRECTIONS (0 up, 1 down, 2 left, 3 right), or None
+# to keep going straight. An observation is one byte per board cell, row by
+# row, holding one of the cell codes below. SnakeEnv.pixels() gives the board
+# as RGB pixels instead, drawn the way the game draws it (needs numpy).
+
+EMPTY = 0
+BODY = 1
+HEAD = 2
+FOOD = 3
+OBSTACLE = 4
+POWER_UP = 5
+OPPONENT = 6
+
+# Reward for dying, eating food is rewarded with the points it scored
+DEATH_REWARD = -1.0
+
+class SnakeEnv:
+    """Single snake game with a reset()/step(action) interface"""
+
+    def __init__(self, config=None, difficulty="Medium", seed=None, max_steps=None, obs_buffer=None):
+        self.engine = SnakeEngine(config, difficulty, seed=0)
+        # The engine reports every cell that changed, so the observation is
+        # patched in place each step instead of being rebuilt from scratch
+        self.engine.dirty = set()
+        self.cols = self.engine.cols
+        self.rows = self.engine.rows
+        self.max_steps = max_steps
+        # Episode i plays derive_seed(seed, i), so one seed fixes the whole run
+        self.seed = new_seed() if seed is None else seed
+        self.episodes = 0
+        self.obs = obs_buffer if obs_buffer is not None else bytearray(self.cols * self.rows)
+        # BoardRaster kept up to date once pixels() is first asked for
+        self.raster = None
+
+    def reset(self, seed=None):
+        # Returns the observation, which is a buffer reused by later steps
+        if seed is None:
+            seed = derive_seed(self.seed, self.episodes)
+            self.episodes += 1
+        self.engine.reset(seed)
+        self.engine.dirty.clear()
+        self.render_observation()
+        if self.raster is not None:
+            self.raster.render()
+        return self.obs
+
+    def step(self, action=None):
+        engine = self.engine
+        truncated = not engine.done and self.max_steps is not None and engine.ticks >= self.max_steps
+        if engine.done or truncated:
+            # Stepping a finished episode changes nothing and earns nothing,
+            # the death is only rewarded on the step that caused it
+            return self.obs, 0.0, True, self.info(truncated)
+
+        score = engine.score
+        engine.step(None if action is None else DIRECTIONS[action])
+
+        # The old head is now body even though its cell was not touched
+        engine.dirty.add(engine.prev_head)
+        self.update_observation(engine.dirty)
+        if self.raster is not None:
+            self.raster.update(engine.dirty)
+        engine.dirty.clear()
+
+        reward = float(engine.score - score)
+        if engine.done and not engine.won:
+            reward += DEATH_REWARD
+        truncated = not engine.done and self.max_steps is not None and engine.ticks >= self.max_steps
+        return self.obs, reward, engine.done or truncated, self.info(truncated)
+
+    def info(self, truncated=False):
+        engine = self.engine
+        return {
+            "score": engine.score,
+            "ticks": engine.ticks,
+            "length": len(engine.snake),
+            "won": engine.won,
+            "death_cause": engine.death_cause,
+            "truncated": truncated,
+            "seed": engine.seed,
+        }
+
+    def pixels(self, scale=1):
+        # The board as a (rows * scale, cols * scale, 3) uint8 RGB array
+        if self.raster is None:
+            from .board_raster import BoardRaster
+            self.raster = BoardRaster(self.engine)
+            self.raster.render()
+        return self.raster.rgb(scale)
+
+    def cell_code(self, cell):
+        engine = self.engine
+        if cell == engine.snake[0]:
+            return HEAD
+        if cell in engine.body_counts:
+            return BODY
+        if cell in engine.opponent_cells:
+            return OPPONENT
+        if cell in engine.obstacles:
+            return OBSTACLE
+        if cell == engine.food:
+            return FOOD
+        power_up = engine.power_up
+        if power_up and cell == (power_up.x, power_up.y):
+            return POWER_UP
+        return EMPTY
+
+    def render_observation(self):
+        engine = self.engine
+        self.obs[:] = bytes(len(self.obs))
+        cells = list(engine.body_counts) + list(engine.opponent_cells) + list(engine.obstacles)
+        if engine.food is not None:
+            cells.append(engine.food)
+        if engine.power_up:
+            cells.append((engine.power_up.x, engine.power_up.y))
+        self.update_observation(cells)
+
+    def update_observation(self, cells):
+        cols = self.cols
+        rows = self.rows
+        obs = self.obs
+        for cell in cells:
+            x, y = cell
+            # A head that left the board is only visible through info
+            if 0 <= x < cols and 0 <= y < rows:
+                obs[y * cols + x] = self.cell_code(cell)
+
+def worker(conn, buffer, first, count, cells, config, difficulty, seeds, max_steps):
+    # Runs envs first..first+count-1 of a VectorEnv and answers its commands
+    view = memoryview(buffer).cast("B")
+    envs = [SnakeEnv(config, difficulty, seeds[i], max_steps, view[(first + i) * cells:(first + i + 1) * cells])
+            for i in range(count)]
+    while True:
+        command, args = conn.recv()
+        if command == "reset":
+            for env in envs:
+                env.reset()
+            conn.send(None)
+        elif command == "step":
+            results = []
+            for env, action in zip(envs, args):
+                _, reward, done, info = env.step(action)
+                if done:
+                    # Auto-reset: info describes the episode that just ended,
+                    # the observation is already the first one of the next
+                    env.reset()
+                results.append((reward, done, info))
+            conn.send(results)
+        elif command == "close":
+            conn.close()
+            return
+
+class VectorEnv:
+    """N SnakeEnvs stepped together across a pool of worker processes"""
+
+    def __init__(self, n, config=None, difficulty="Medium", seed=None, max_steps=None, processes=None):
+        self.n = n
+        config = config or Config()
+        probe = SnakeEngine(config, difficulty, seed=0)
+        self.cols = probe.cols
+        self.rows = probe.rows
+        self.cells = self.cols * self.rows
+
+        # Observations of every env, back to back, written by the workers in place.
+        # multiprocessing is imported here so a single SnakeEnv starts faster.
+        import multiprocessing
+        context = multiprocessing.get_context()
+        self.buffer = context.RawArray("B", n * self.cells)
+        self.obs = memoryview(self.buffer).cast("B")
+
+        # One independent stream per env, each env then derives its episode seeds from it
+        seeds = spawn_seeds(new_seed() if seed is None else seed, n)
+
+        processes = min(n, processes or os.cpu_count() or 1)
+        self.workers = []
+        self.slices = []
+        first = 0
+        for i in range(processes):
+            count = n // processes + (i < n % processes)
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=worker, name=f"snake-env-{i}", daemon=True,
+                args=(child, self.buffer, first, count, self.cells, config, difficulty,
+                      seeds[first:first + count], max_steps))
+            process.start()
+            child.close()
+            self.workers.append((process, parent))
+            self.slices.append((first, count))
+            first += count
+        self.closed = False
+
+    def observation(self, i):
+        return self.obs[i * self.cells:(i + 1) * self.cells]
+
+    def reset(self):
+        for _, conn in self.workers:
+            conn.send(("reset", None))
+        for _, conn in self.workers:
+            conn.recv()
+        return self.obs
+
+    def step(self, actions):
+        # Returns (observations, rewards, dones, infos); finished envs are
+        # reset straight away and their info holds the episode that ended
+        for (_, conn), (first, count) in zip(self.workers, self.slices):
+            conn.send(("step", list(actions[first:first + count])))
+        rewards = []
+        dones = []
+        infos = []
+        for _, conn in self.workers:
+            for reward, done, info in conn.recv():
+                rewards.append(reward)
+                dones.append(done)
+                infos.append(info)
+        return self.obs, rewards, dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for process, conn in self.workers:
+            conn.send(("close", None))
+            conn.close()
+            process.join()
+        self.obs.release()
@@ -0,0 +1,422 @@
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+
+from .snake_arena import ArenaEngine
+from .snake_engine import Config, PowerUp, DIRECTIONS
+
+# Networked arena games for Ular yang Mengular.
+#
+# GameServer runs the only real ArenaEngine and every player connects to it
+# over TCP. A new client gets one JSON snapshot of the board, after that the
+# server sends a small binary delta per tick: for every snake that moved its
+# new head, direction, score and how many tail cells it lost, for every snake
+# that died the cause, plus the food and power-up when they moved. A delta
+# grows with the number of snakes but never with their length, so bandwidth
+# and server work stay flat however long the snakes get.
+#
+# GameClient mirrors the board from those deltas. Turns are sent as soon as
+# they are made and also applied locally: the client's own snake is drawn
+# from the last server state moved on by the ticks that have gone by since,
+# using the turns the server has not acknowledged yet, and snaps back to the
+# server's version whenever the next delta says otherwise.
+#
+# Every message is framed as u32 payload length, u8 kind, payload (little endian).
+
+DEFAULT_PORT = 5555
+
+FRAME = struct.Struct("<IB")
+# Client to server: sequence number u32, direction index u8
+INPUT = 1
+INPUT_MESSAGE = struct.Struct("<IB")
+# Server to client: JSON snapshot with the player's index, sent once on joining
+WELCOME = 2
+# Server to client, once per tick:
+#   tick u32, speed multiplier f32, last input applied for this player u32,
+#   flags u8, changed snake count u8
+#   food x, y i16 (-1, -1 for none)              if FOOD_MOVED
+#   power-up x, y i16, type u8 (-1, -1 for none) if POWER_UP_MOVED
+#   winner i8 (-1 for none)                      if ROUND_OVER
+#   per changed snake: index u8, status u8, head x, y i16, direction or
+#   death cause u8, tail cells removed u16, score u32
+DELTA = 3
+DELTA_HEADER = struct.Struct("<IfIBB")
+CELL = struct.Struct("<hh")
+POWER_UP_CELL = struct.Struct("<hhB")
+WINNER = struct.Struct("<b")
+SNAKE_CHANGE = struct.Struct("<BBhhBHI")
+
+# Delta flags
+FOOD_MOVED = 1
+POWER_UP_MOVED = 2
+ROUND_OVER = 4
+
+# Snake statuses in a delta
+MOVED = 1
+DIED = 2
+DEATH_CAUSES = ("wall", "self", "obstacle", "opponent", "head-on")
+
+# Furthest the client runs its own snake ahead of the last server tick
+MAX_PREDICTED_TICKS = 3
+
+async def read_message(reader):
+    # (kind, payload), or (None, None) once the other side has gone
+    try:
+        length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+        payload = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None, None
+    return kind, payload
+
+def write_message(writer, kind, payload):
+    writer.write(FRAME.pack(len(payload), kind) + payload)
+
+def pack_cell(cell):
+    return CELL.pack(*cell) if cell is not None else CELL.pack(-1, -1)
+
+def unpack_cell(payload, pos):
+    x, y = CELL.unpack_from(payload, pos)
+    return (None if x < 0 else (x, y)), pos + CELL.size
+
+def turned(direction, turn):
+    # Sideways turns only, like ArenaEngine.turn
+    if (turn[0] == 0 and direction[1] == 0) or (turn[1] == 0 and direction[0] == 0):
+        return turn
+    return direction
+
+class GameServer:
+    """Authoritative arena simulation streaming per-tick deltas to its players"""
+
+    def __init__(self, config=None, difficulty="Medium", seed=None, players=2, bots=0,
+                 host="127.0.0.1", port=DEFAULT_PORT):
+        self.config = config or Config()
+        self.difficulty = difficulty
+        self.seed = seed
+        self.players = players
+        self.bots = bots
+        self.host = host
+        self.port = port
+        self.arena = None
+        # Writer per player index, None once it has disconnected
+        self.writers = []
+        # Turns waiting per player, one is applied per tick like the local game does
+        self.inputs = [deque() for _ in range(players)]
+        # Sequence number of the last turn applied per player
+        self.acks = [0] * players
+        self.joined = None
+        self.server = None
+        # Delta bytes sent, for checking the bandwidth stays flat
+        self.bytes_sent = 0
+
+    async def start(self):
+        # Starts listening, port then holds the real port (port 0 picks a free
+        # one). The event is made here because before Python 3.10 it binds to
+        # the loop that is current when it is created, not the running one.
+        self.joined = asyncio.Event()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve(self):
+        # Waits for every player, plays one round and returns the finished
+        # ArenaEngine. Callers that need the port first await start() themselves.
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.joined.wait()
+            await self.run()
+            for writer in self.writers:
+                if writer is not None:
+                    writer.close()
+        return self.arena
+
+    async def handle(self, reader, writer):
+        if len(self.writers) >= self.players:
+            # Round is full
+            writer.close()
+            return
+        index = len(self.writers)
+        self.writers.append(writer)
+        if len(self.writers) == self.players:
+            self.joined.set()
+
+        while True:
+            kind, payload = await read_message(reader)
+            if kind is None:
+                break
+            if kind == INPUT:
+                seq, direction = INPUT_MESSAGE.unpack(payload)
+                if direction < len(DIRECTIONS):
+                    self.inputs[index].append((seq, DIRECTIONS[direction]))
+        self.writers[index] = None
+
+    async def run(self):
+        arena = self.arena = ArenaEngine(self.config, self.difficulty, self.seed,
+                                         humans=self.players, bots=self.bots)
+        for index, writer in enumerate(self.writers):
+            if writer is not None:
+                write_message(writer, WELCOME, json.dumps(self.snapshot(index)).encode())
+        await self.drain()
+
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while not arena.done:
+            next_tick += 1.0 / arena.tick_rate()
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self.tick()
+            await self.drain()
+
+    def tick(self):
+        arena = self.arena
+        actions = []
+        for index, queue in enumerate(self.inputs):
+            direction = None
+            if queue:
+                self.acks[index], direction = queue.popleft()
+            actions.append(direction)
+
+        lengths = [len(snake.snake) for snake in arena.snakes]
+        alive = [snake.alive for snake in arena.snakes]
+        food = arena.food
+        power_up = arena.power_up
+        arena.step(actions)
+
+        flags = 0
+        body = bytearray()
+        if arena.food != food:
+            flags |= FOOD_MOVED
+            body += pack_cell(arena.food)
+        if arena.power_up is not power_up:
+            flags |= POWER_UP_MOVED
+            if arena.power_up is None:
+                body += POWER_UP_CELL.pack(-1, -1, 0)
+            else:
+                body += POWER_UP_CELL.pack(arena.power_up.x, arena.power_up.y, arena.power_up.type)
+        if arena.done:
+            flags |= ROUND_OVER
+            body += WINNER.pack(-1 if arena.winner is None else arena.winner.index)
+
+        changed = 0
+        for snake, length, was_alive in zip(arena.snakes, lengths, alive):
+            if snake.alive:
+                head = snake.snake[0]
+                # One head went on, the tail lost whatever that does not account for
+                removed = length + 1 - len(snake.snake)
+                body += SNAKE_CHANGE.pack(snake.index, MOVED, head[0], head[1],
+                                          DIRECTIONS.index(snake.direction), removed, snake.score)
+                changed += 1
+            elif was_alive:
+                body += SNAKE_CHANGE.pack(snake.index, DIED, 0, 0,
+                                          DEATH_CAUSES.index(snake.death_cause), length, snake.score)
+                changed += 1
+
+        for index, writer in enumerate(self.writers):
+            if writer is not None:
+                header = DELTA_HEADER.pack(arena.ticks, arena.speed_multiplier, self.acks[index], flags, changed)
+                write_message(writer, DELTA, header + body)
+                self.bytes_sent += len(header) + len(body)
+
+    async def drain(self):
+        writers = [writer for writer in self.writers if writer is not None]
+        results = await asyncio.gather(*(writer.drain() for writer in writers), return_exceptions=True)
+        for writer, result in zip(writers, results):
+            if isinstance(result, Exception) and writer in self.writers:
+                # Gone without a clean close, its snake carries on straight
+                self.writers[self.writers.index(writer)] = None
+
+    def snapshot(self, index):
+        arena = self.arena
+        power_up = arena.power_up
+        return {
+            "index": index,
+            "difficulty": arena.difficulty,
+            "cols": arena.cols,
+            "rows": arena.rows,
+            "tick": arena.ticks,
+            "speed": arena.speed_multiplier,
+            "obstacles": sorted(arena.obstacles),
+            "food": arena.food,
+            "power_up": None if power_up is None else [power_up.x, power_up.y, power_up.type],
+            "snakes": [{"snake": list(snake.snake), "direction": DIRECTIONS.index(snake.direction),
+                        "alive": snake.alive, "score": snake.score, "bot": snake.bot}
+                       for snake in arena.snakes],
+        }
+
+class NetSnake:
+    """One snake on a GameClient's board"""
+
+    def __init__(self, index, bot=False):
+        self.index = index
+        self.bot = bot
+        self.snake = deque()
+        self.direction = DIRECTIONS[3]
+        self.alive = True
+        self.score = 0
+        self.death_cause = None
+
+class GameClient:
+    """Copy of a GameServer's board kept up to date from its deltas"""
+
+    # Has the attributes the arena drawing code reads from an ArenaEngine:
+    # cols, rows, snakes, food, power_up, obstacles, ticks, done and winner
+
+    def __init__(self, config=None):
+        self.config = config or Config()
+        self.reader = None
+        self.writer = None
+        self.index = None
+        self.difficulty = "Medium"
+        self.cols = 0
+        self.rows = 0
+        self.snakes = []
+        self.food = None
+        self.power_up = None
+        self.obstacles = set()
+        self.ticks = 0
+        self.speed_multiplier = 1.0
+        self.done = False
+        self.winner = None
+        # Turns sent but not applied by the server yet, as (seq, direction)
+        self.pending = deque()
+        self.seq = 0
+        # When the last delta arrived, the prediction runs on from there
+        self.received = time.perf_counter()
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT):
+        # Returns once the round has started and the snapshot is in
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        kind, payload = await read_message(self.reader)
+        if kind != WELCOME:
+            self.close()
+            raise ConnectionError(f"{host}:{port} closed the connection before the round started")
+        self.load_snapshot(json.loads(payload))
+
+    def load_snapshot(self, state):
+        self.index = state["index"]
+        self.difficulty = state["difficulty"]
+        self.cols = state["cols"]
+        self.rows = state["rows"]
+        self.ticks = state["tick"]
+        self.speed_multiplier = state["speed"]
+        self.obstacles = {tuple(cell) for cell in state["obstacles"]}
+        self.food = None if state["food"] is None else tuple(state["food"])
+        power_up = state["power_up"]
+        self.power_up = None if power_up is None else PowerUp(*power_up)
+        self.snakes = []
+        for i, data in enumerate(state["snakes"]):
+            snake = NetSnake(i, data["bot"])
+            snake.snake = deque(tuple(cell) for cell in data["snake"])
+            snake.direction = DIRECTIONS[data["direction"]]
+            snake.alive = data["alive"]
+            snake.score = data["score"]
+            self.snakes.append(snake)
+        self.received = time.perf_counter()
+
+    def tick_rate(self):
+        return self.config.DIFFICULTY_SPEEDS[self.difficulty] * self.speed_multiplier
+
+    def turn(self, direction):
+        # Sent straight away, the prediction shows it before the server has it
+        if direction is None or self.done or self.writer is None:
+            return
+        self.seq += 1
+        self.pending.append((self.seq, direction))
+        write_message(self.writer, INPUT, INPUT_MESSAGE.pack(self.seq, DIRECTIONS.index(direction)))
+
+    async def receive(self):
+        # Applies the next delta, False once the round is over or the server is gone
+        kind, payload = await read_message(self.reader)
+        if kind is None:
+            self.done = True
+            return False
+        if kind == DELTA:
+            self.apply_delta(payload)
+        return not self.done
+
+    async def run(self):
+        # Keeps the board up to date until the round ends
+        while await self.receive():
+            pass
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def apply_delta(self, payload):
+        self.ticks, self.speed_multiplier, ack, flags, changed = DELTA_HEADER.unpack_from(payload, 0)
+        pos = DELTA_HEADER.size
+        while self.pending and self.pending[0][0] <= ack:
+            self.pending.popleft()
+
+        if flags & FOOD_MOVED:
+            self.food, pos = unpack_cell(payload, pos)
+        if flags & POWER_UP_MOVED:
+            x, y, power_up_type = POWER_UP_CELL.unpack_from(payload, pos)
+            pos += POWER_UP_CELL.size
+            self.power_up = None if x < 0 else PowerUp(x, y, power_up_type)
+        if flags & ROUND_OVER:
+            winner, = WINNER.unpack_from(payload, pos)
+            pos += WINNER.size
+            self.done = True
+            self.winner = None if winner < 0 else self.snakes[winner]
+
+        for _ in range(changed):
+            index, status, x, y, code, removed, score = SNAKE_CHANGE.unpack_from(payload, pos)
+            pos += SNAKE_CHANGE.size
+            snake = self.snakes[index]
+            snake.score = score
+            if status == DIED:
+                snake.alive = False
+                snake.death_cause = DEATH_CAUSES[code]
+                snake.snake.clear()
+                continue
+            snake.direction = DIRECTIONS[code]
+            snake.snake.appendleft((x, y))
+            for _ in range(removed):
+                snake.snake.pop()
+        self.received = time.perf_counter()
+
+    def predicted_snake(self, now=None):
+        # This player's snake as it should look by now: the server's copy
+        # moved on by the ticks since the last delta, turning as the
+        # unacknowledged inputs say. Collisions are left to the server.
+        snake = self.snakes[self.index]
+        cells = deque(snake.snake)
+        if not snake.alive or self.done or not cells:
+            return cells
+        now = time.perf_counter() if now is None else now
+        ahead = min(int((now - self.received) * self.tick_rate()), MAX_PREDICTED_TICKS)
+        direction = snake.direction
+        for tick in range(ahead):
+            # The server applies one pending turn per tick, oldest first
+            if tick < len(self.pending):
+                direction = turned(direction, self.pending[tick][1])
+            head = cells[0]
+            new_head = (head[0] + direction[0], head[1] + direction[1])
+            cells.appendleft(new_head)
+            if new_head != self.food:
+                cells.pop()
+        return cells
+
+async def serve(args):
+    server = GameServer(difficulty=args.difficulty, seed=args.seed, players=args.players, bots=args.bots,
+                        host=args.host, port=args.port)
+    print(f"Waiting for {args.players} player(s) on {args.host}:{args.port}")
+    arena = await server.serve()
+    for snake in arena.snakes:
+        name = f"Snake {snake.index + 1}" if snake.bot else f"Player {snake.index + 1}"
+        print(f"{name}: {snake.score}" + ("" if snake.alive else f" ({snake.death_cause})"))
+    print(f"{arena.ticks} ticks, {server.bytes_sent / max(1, arena.ticks):.0f} delta bytes per tick")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ular yang Mengular arena server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on, 0.0.0.0 for the LAN")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=2, help="players to wait for before the round starts")
+    parser.add_argument("--bots", type=int, default=0, help="computer snakes joining the round")
+    parser.add_argument("--difficulty", default="Medium", choices=["Easy", "Medium", "Hard"])
+    parser.add_argument("--seed", type=int)
+    asyncio.run(serve(parser.parse_args()))
@@ -0,0 +1,635 @@
+import itertools
+from collections import OrderedDict, deque
+
+import pygame
+
+# Atlas tiles are the palette indexes, one tile per color
+from .palette import (GRADIENT_LENGTH, COLOR_COUNT as TILE_COUNT, EMPTY as EMPTY_CELL, FOOD as FOOD_TILE,
+                      OBSTACLE as OBSTACLE_TILE, OPPONENT_BODY as OPPONENT_BODY_TILE,
+                      OPPONENT_HEAD as OPPONENT_HEAD_TILE, POWER_UP as POWER_UP_TILE,
+                      palette, power_up_color, segment_color)
+
+# Render backends for the pygame front end.
+# SnakeGame.draw_game picks one of these based on Config.RENDER_MODE.
+
+def interpolated_rect(config, start, end, alpha):
+    # Rect between two neighbouring cells, None when they are not neighbours
+    # (shield wrap, Shrink Snake) so the caller can fall back to the cell itself
+    if abs(end[0] - start[0]) + abs(end[1] - start[1]) != 1:
+        return None
+    grid = config.GRID_SIZE
+    x = start[0] + (end[0] - start[0]) * alpha
+    y = start[1] + (end[1] - start[1]) * alpha
+    return pygame.Rect(round(x * grid), round(y * grid), grid, grid)
+
+# Between ticks the head slides into its new cell and the old tail slides
+# out of the one it left, the rest of the body stays on whole cells
+def interpolated_head_rect(config, engine, alpha):
+    rect = interpolated_rect(config, engine.prev_head, engine.snake[0], alpha)
+    if rect is None:
+        grid = config.GRID_SIZE
+        rect = pygame.Rect(engine.snake[0][0] * grid, engine.snake[0][1] * grid, grid, grid)
+    return rect
+
+def interpolated_tail_rect(config, engine, alpha):
+    if engine.prev_tail in engine.body_counts:
+        return None
+    return interpolated_rect(config, engine.prev_tail, engine.snake[-1], alpha)
+
+def bake_grid(config):
+    # The empty game area with the grid lines the full redraw draws, for
+    # renderers to blit instead of drawing the lines every frame. It is one
+    # pixel wider and taller than the game area for the end points of the lines.
+    grid = config.GRID_SIZE
+    surface = pygame.Surface((config.GAME_WIDTH + 1, config.GAME_HEIGHT + 1))
+    surface.fill(config.BLACK)
+    for x in range(0, config.GAME_WIDTH, grid):
+        pygame.draw.line(surface, config.GRAY, (x, 0), (x, config.GAME_HEIGHT))
+    for y in range(0, config.GAME_HEIGHT, grid):
+        pygame.draw.line(surface, config.GRAY, (0, y), (config.GAME_WIDTH, y))
+    return surface.convert() if pygame.display.get_surface() else surface
+
+class TextCache:
+    """Shared font registry plus a bounded LRU of rendered text surfaces"""
+
+    def __init__(self, max_entries=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_entries = max_entries
+
+    def font(self, size):
+        # pygame.font.Font(None, size) reloads the default font, so keep one per size
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        # Only strings that changed since they were last drawn get here
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+class DirtyRectRenderer:
+    """Blits a cached background and pushes only the changed cells to the display"""
+
+    def __init__(self, game):
+        self.game = game
+        self.config = game.config
+        self.background = None
+        self.baked_obstacles = None
+        self.full_redraw = True
+        # Gradient cells drawn last frame, they shift shade every tick
+        self.window = []
+        self.drawn_tick = None
+        self.interp_cells = []
+        self.opponent_heads = set()
+        self.panel_key = None
+
+    def invalidate(self):
+        # Called after anything else has drawn over the board (menus, overlays)
+        self.full_redraw = True
+
+    def bake_background(self, obstacles):
+        config = self.config
+        grid = config.GRID_SIZE
+        surface = bake_grid(config)
+
+        # Obstacles never move during a game so they live in the background
+        for obs in obstacles:
+            pygame.draw.rect(surface, config.PURPLE, (obs[0] * grid, obs[1] * grid, grid, grid))
+
+        self.background = surface
+        self.baked_obstacles = obstacles
+
+    def cell_rect(self, cell):
+        grid = self.config.GRID_SIZE
+        return pygame.Rect(cell[0] * grid, cell[1] * grid, grid, grid)
+
+    def draw(self):
+        game = self.game
+        engine = game.engine
+        screen = game.screen
+        config = self.config
+
+        if engine.dirty is None:
+            engine.dirty = set()
+            self.full_redraw = True
+        if self.baked_obstacles is not engine.obstacles:
+            self.bake_background(engine.obstacles)
+            self.full_redraw = True
+
+        window = list(itertools.islice(engine.snake, GRADIENT_LENGTH))
+        opponent_heads = {opponent.snake[0] for opponent in engine.opponents if opponent.alive}
+        alpha = game.alpha
+        interpolate = config.INTERPOLATE and alpha < 1
+        interp_cells = [engine.prev_head, engine.snake[0], engine.prev_tail, engine.snake[-1]] if interpolate else []
+
+        if self.full_redraw:
+            screen.fill(config.BLACK)
+            screen.blit(self.background, (0, 0))
+            cells = set(engine.body_counts)
+            cells.update(engine.opponent_cells)
+            if engine.food is not None:
+                cells.add(engine.food)
+            if engine.power_up:
+                cells.add((engine.power_up.x, engine.power_up.y))
+        else:
+            # Cells that changed since the last frame, plus the gradient head
+            # section whose shades move along the body once per tick
+            cells = set(engine.dirty)
+            if engine.ticks != self.drawn_tick:
+                cells.update(self.window)
+                cells.update(window)
+                # Opponent heads turn into body without their cell changing
+                cells.update(self.opponent_heads)
+        # The sliding head and tail touch these cells on every frame
+        cells.update(self.interp_cells)
+        cells.update(interp_cells)
+
+        rects = []
+        window_cells = set(window)
+        board = pygame.Rect(0, 0, config.GAME_WIDTH, config.GAME_HEIGHT)
+        for cell in cells:
+            rect = self.cell_rect(cell)
+            if not board.contains(rect):
+                continue
+            if not self.full_redraw:
+                screen.blit(self.background, rect, rect)
+            if cell == engine.food:
+                pygame.draw.rect(screen, config.RED, rect)
+            power_up = engine.power_up
+            if power_up and cell == (power_up.x, power_up.y):
+                pygame.draw.rect(screen, power_up_color(config, power_up.type), rect)
+            if cell in engine.opponent_cells:
+                pygame.draw.rect(screen, config.ORANGE if cell in opponent_heads else config.DARK_ORANGE, rect)
+            if cell in engine.body_counts and cell not in window_cells:
+                pygame.draw.rect(screen, segment_color(config, GRADIENT_LENGTH), rect)
+            rects.append(rect)
+
+        if interpolate:
+            tail_rect = interpolated_tail_rect(config, engine, alpha)
+            if tail_rect:
+                pygame.draw.rect(screen, segment_color(config, len(engine.snake)), tail_rect.clip(board))
+
+        # Gradient section, drawn in order like the full renderer does
+        for i, cell in enumerate(window):
+            if cell in cells and not (i == 0 and interpolate):
+                pygame.draw.rect(screen, segment_color(config, i), self.cell_rect(cell))
+
+        if interpolate:
+            pygame.draw.rect(screen, config.GREEN, interpolated_head_rect(config, engine, alpha).clip(board))
+
+        # Obstacles stay on top of anything that slid under them
+        for cell in cells:
+            if cell in engine.obstacles:
+                pygame.draw.rect(screen, config.PURPLE, self.cell_rect(cell))
+
+        self.window = window
+        self.interp_cells = interp_cells
+        self.opponent_heads = opponent_heads
+        self.drawn_tick = engine.ticks
+        engine.dirty.clear()
+
+        # Side panel, only when one of its lines would read differently
+        panel_key = self.side_panel_key()
+        if self.full_redraw or panel_key != self.panel_key:
+            # The first column keeps the grid line ends from the background
+            panel = pygame.Rect(config.GAME_WIDTH + 1, 0, config.WIDTH - config.GAME_WIDTH - 1, config.HEIGHT)
+            screen.fill(config.BLACK, panel)
+            with game.phase("draw_side_panel"):
+                game.draw_side_panel()
+            rects.append(panel)
+            self.panel_key = panel_key
+
+        if self.full_redraw:
+            game.present()
+            self.full_redraw = False
+        else:
+            game.present(rects)
+
+    def side_panel_key(self):
+        game = self.game
+        engine = game.engine
+        effects = tuple((power_up_type, stacks, f"{time_left:.1f}")
+                        for power_up_type, stacks, time_left in game.active_effects())
+        return (engine.score, game.session_high_score, game.difficulty, effects)
+
+class AtlasRenderer:
+    """Draws every cell as a tile of a pre-built atlas in one blit batch per layer"""
+
+    def __init__(self, game):
+        self.game = game
+        self.config = game.config
+        self.tiles = self.build_atlas()
+        self.background = None
+        self.baked_obstacles = None
+        self.obstacle_batch = []
+        # Batches of the last tick drawn, they only change when the engine steps
+        self.drawn_snake = None
+        self.drawn_tick = None
+        self.drawn_head = None
+        self.item_batch = []
+        self.gradient_batch = []
+        self.board = None
+        # Body cells past the gradient, head end first, and how many segments are on each
+        self.tail = deque()
+        self.tail_counts = {}
+
+    def invalidate(self):
+        # Every frame is drawn in full, nothing to throw away
+        pass
+
+    def build_atlas(self):
+        # One surface holding a tile per palette color, the tiles are subsurfaces of it
+        grid = self.config.GRID_SIZE
+        colors = palette(self.config)[:TILE_COUNT]
+        atlas = pygame.Surface((grid * TILE_COUNT, grid))
+        for i, color in enumerate(colors):
+            atlas.fill(color, (i * grid, 0, grid, grid))
+        if pygame.display.get_surface():
+            atlas = atlas.convert()
+        self.atlas = atlas
+        return [atlas.subsurface((i * grid, 0, grid, grid)) for i in range(TILE_COUNT)]
+
+    def bake(self, obstacles):
+        # Grid lines in the background, obstacles as a batch drawn over the snake
+        grid = self.config.GRID_SIZE
+        self.background = bake_grid(self.config)
+        # The background plus the body past the gradient, see update_body
+        self.board = self.background.copy()
+        self.drawn_snake = None
+        tile = self.tiles[OBSTACLE_TILE]
+        self.obstacle_batch = [(tile, (x * grid, y * grid)) for x, y in obstacles]
+        self.baked_obstacles = obstacles
+
+    def build_items(self, engine):
+        grid = self.config.GRID_SIZE
+        tiles = self.tiles
+        items = []
+        if engine.food is not None:
+            items.append((tiles[FOOD_TILE], (engine.food[0] * grid, engine.food[1] * grid)))
+        power_up = engine.power_up
+        if power_up:
+            items.append((tiles[POWER_UP_TILE + power_up.type], (power_up.x * grid, power_up.y * grid)))
+        head_tile = tiles[OPPONENT_HEAD_TILE]
+        body_tile = tiles[OPPONENT_BODY_TILE]
+        for opponent in engine.opponents:
+            for i, (x, y) in enumerate(opponent.snake):
+                items.append((head_tile if i == 0 else body_tile, (x * grid, y * grid)))
+        self.item_batch = items
+
+    def update_body(self, engine, moved):
+        # Body without the head, which slides between ticks when interpolating.
+        # The gradient section is a new batch every tick. Past it every segment
+        # has the last shade, so those are drawn straight into the board: a
+        # tick only adds the segment that left the gradient and clears the
+        # cell the tail left, however long the snake is.
+        grid = self.config.GRID_SIZE
+        tiles = self.tiles
+        snake = engine.snake
+        self.gradient_batch = [(tiles[i], (x * grid, y * grid))
+                               for i, (x, y) in enumerate(itertools.islice(snake, 1, GRADIENT_LENGTH), 1)]
+        tail_tile = tiles[GRADIENT_LENGTH]
+        board = self.board
+        tail = self.tail
+        counts = self.tail_counts
+        if not moved:
+            board.blit(self.background, (0, 0))
+            tail.clear()
+            counts.clear()
+            tail.extend(itertools.islice(snake, GRADIENT_LENGTH, None))
+            for cell in tail:
+                counts[cell] = counts.get(cell, 0) + 1
+            board.blits([(tail_tile, (x * grid, y * grid)) for x, y in counts], doreturn=False)
+            return
+
+        tail_length = max(0, len(snake) - GRADIENT_LENGTH)
+        if tail_length:
+            cell = snake[GRADIENT_LENGTH]
+            tail.appendleft(cell)
+            counts[cell] = counts.get(cell, 0) + 1
+            if counts[cell] == 1:
+                board.blit(tail_tile, (cell[0] * grid, cell[1] * grid))
+        while len(tail) > tail_length:
+            cell = tail.pop()
+            counts[cell] -= 1
+            if not counts[cell]:
+                del counts[cell]
+                rect = pygame.Rect(cell[0] * grid, cell[1] * grid, grid, grid)
+                board.blit(self.background, rect, rect)
+
+    def draw(self):
+        game = self.game
+        engine = game.engine
+        screen = game.screen
+        config = self.config
+        grid = config.GRID_SIZE
+        tiles = self.tiles
+        snake = engine.snake
+
+        if self.baked_obstacles is not engine.obstacles:
+            self.bake(engine.obstacles)
+        if self.drawn_snake is not snake or engine.ticks != self.drawn_tick:
+            # One step on from the last tick drawn lets the body batch be patched
+            moved = self.drawn_snake is snake and engine.ticks == self.drawn_tick + 1 and \
+                len(snake) > 1 and snake[1] == self.drawn_head
+            self.update_body(engine, moved)
+            self.build_items(engine)
+            self.drawn_snake = snake
+            self.drawn_tick = engine.ticks
+            self.drawn_head = snake[0]
+
+        # pygame-ce has fblits, plain pygame the slower blits
+        blits = getattr(screen, "fblits", None)
+        if blits is None:
+            def blits(batch):
+                screen.blits(batch, doreturn=False)
+
+        # The board covers the whole game area, only the side panel needs clearing
+        screen.fill(config.BLACK, (config.GAME_WIDTH, 0, config.WIDTH - config.GAME_WIDTH, config.HEIGHT))
+        screen.blit(self.board, (0, 0))
+        blits(self.item_batch)
+
+        # Same layer order as the full redraw: sliding tail, head, body, sliding head
+        alpha = game.alpha
+        interpolate = config.INTERPOLATE and alpha < 1
+        if interpolate:
+            tail_rect = interpolated_tail_rect(config, engine, alpha)
+            if tail_rect:
+                screen.blit(tiles[min(len(snake), GRADIENT_LENGTH)], tail_rect)
+        else:
+            head = snake[0]
+            screen.blit(tiles[0], (head[0] * grid, head[1] * grid))
+        blits(self.gradient_batch)
+        if interpolate:
+            screen.blit(tiles[0], interpolated_head_rect(config, engine, alpha))
+
+        blits(self.obstacle_batch)
+
+        with game.phase("draw_side_panel"):
+            game.draw_side_panel()
+        game.present()
+
+# Color of empty cells in the raster, keyed out so the grid lines show through
+RASTER_KEY = (255, 0, 255)
+
+class RasterRenderer:
+    """Draws the board from a NumPy cell grid with one palette blit and one scale"""
+
+    def __init__(self, game):
+        self.game = game
+        self.config = game.config
+        self.raster = None
+        colors = palette(self.config)
+        colors[EMPTY_CELL] = RASTER_KEY
+        self.colors = colors
+        self.cell_surface = None
+        self.scaled = None
+        self.background = None
+        self.board = None
+        self.full_render = True
+        self.drawn_snake = None
+        self.drawn_tick = None
+
+    def invalidate(self):
+        # After a reset the engine's changed cells no longer describe the board
+        self.full_render = True
+
+    def bake_background(self):
+        self.background = bake_grid(self.config)
+        self.board = self.background.copy()
+
+    def render_board(self, engine):
+        # Grid to pixels: one blit at a pixel per cell, one scale up to GRID_SIZE,
+        # then the keyed-out result over the grid lines
+        from .board_raster import BoardRaster
+
+        if self.raster is None or self.raster.engine is not engine:
+            self.raster = BoardRaster(engine)
+            self.cell_surface = pygame.Surface((engine.cols, engine.rows), 0, 8)
+            self.cell_surface.set_palette(self.colors)
+            self.full_render = True
+        if engine.dirty is None:
+            engine.dirty = set()
+            self.full_render = True
+        if self.full_render:
+            self.raster.render()
+            self.full_render = False
+        else:
+            self.raster.update(engine.dirty)
+        engine.dirty.clear()
+
+        pygame.surfarray.blit_array(self.cell_surface, self.raster.cells)
+        cells = self.cell_surface.convert() if pygame.display.get_surface() else self.cell_surface.convert(32)
+        grid = self.config.GRID_SIZE
+        size = (engine.cols * grid, engine.rows * grid)
+        if self.scaled is None or self.scaled.get_size() != size or self.scaled.get_bitsize() != cells.get_bitsize():
+            self.scaled = pygame.Surface(size, 0, cells)
+            self.scaled.set_colorkey(RASTER_KEY)
+        pygame.transform.scale(cells, size, self.scaled)
+        if self.background is None:
+            self.bake_background()
+        self.board.blit(self.background, (0, 0))
+        self.board.blit(self.scaled, (0, 0))
+
+    def draw(self):
+        game = self.game
+        engine = game.engine
+        screen = game.screen
+        config = self.config
+        grid = config.GRID_SIZE
+
+        # The grid only changes when the engine steps
+        if self.full_render or self.drawn_snake is not engine.snake or engine.ticks != self.drawn_tick:
+            self.render_board(engine)
+            self.drawn_snake = engine.snake
+            self.drawn_tick = engine.ticks
+
+        # The board covers the whole game area, only the side panel needs clearing
+        screen.fill(config.BLACK, (config.GAME_WIDTH, 0, config.WIDTH - config.GAME_WIDTH, config.HEIGHT))
+        screen.blit(self.board, (0, 0))
+
+        # The grid holds whole cells, so between ticks the head is taken out
+        # of its cell and the sliding head and tail are drawn over the board
+        alpha = game.alpha
+        if config.INTERPOLATE and alpha < 1:
+            head = engine.snake[0]
+            head_cell = pygame.Rect(head[0] * grid, head[1] * grid, grid, grid)
+            screen.blit(self.background, head_cell, head_cell)
+            if head in engine.opponent_cells:
+                # The opponent the head ran into stays under it
+                color = config.ORANGE if head in self.raster.opponent_heads else config.DARK_ORANGE
+                pygame.draw.rect(screen, color, head_cell)
+            tail_rect = interpolated_tail_rect(config, engine, alpha)
+            if tail_rect:
+                # Only the part in the cell the tail left, the rest is under the new tail
+                tail = engine.prev_tail
+                pygame.draw.rect(screen, segment_color(config, len(engine.snake)),
+                                 tail_rect.clip((tail[0] * grid, tail[1] * grid, grid, grid)))
+            pygame.draw.rect(screen, config.GREEN, interpolated_head_rect(config, engine, alpha))
+            # Obstacles stay on top of a head sliding under them
+            for cell in (engine.prev_head, head):
+                if cell in engine.obstacles:
+                    pygame.draw.rect(screen, config.PURPLE, (cell[0] * grid, cell[1] * grid, grid, grid))
+
+        with game.phase("draw_side_panel"):
+            game.draw_side_panel()
+        game.present()
+
+# Width in pixels of the huge-board minimap in the side panel
+MINIMAP_WIDTH = 240
+
+class CameraRenderer:
+    """Draws the part of a big board around the head, plus a minimap of all of it"""
+
+    def __init__(self, game):
+        self.game = game
+        self.config = game.config
+        self.view_cols = self.config.GAME_WIDTH // self.config.GRID_SIZE
+        self.view_rows = self.config.GAME_HEIGHT // self.config.GRID_SIZE
+        self.minimap = None
+        self.minimap_scale = 1.0
+        self.baked_obstacles = None
+
+    def invalidate(self):
+        # Every frame is drawn in full, nothing to throw away
+        pass
+
+    def camera(self, engine, alpha):
+        # Top-left corner of the view in (fractional) cells, centred on the
+        # sliding head and kept inside the board
+        head = engine.snake[0]
+        x, y = head
+        if self.config.INTERPOLATE and alpha < 1 and \
+                abs(head[0] - engine.prev_head[0]) + abs(head[1] - engine.prev_head[1]) == 1:
+            x = engine.prev_head[0] + (head[0] - engine.prev_head[0]) * alpha
+            y = engine.prev_head[1] + (head[1] - engine.prev_head[1]) * alpha
+        left = max(0.0, min(x + 0.5 - self.view_cols / 2, engine.cols - self.view_cols))
+        top = max(0.0, min(y + 0.5 - self.view_rows / 2, engine.rows - self.view_rows))
+        return left, top
+
+    def draw(self):
+        game = self.game
+        engine = game.engine
+        screen = game.screen
+        config = self.config
+        grid = config.GRID_SIZE
+        alpha = game.alpha
+
+        left, top = self.camera(engine, alpha)
+        offset_x = round(left * grid)
+        offset_y = round(top * grid)
+        x0 = int(left)
+        y0 = int(top)
+        area = (x0, y0, min(engine.cols, x0 + self.view_cols + 1), min(engine.rows, y0 + self.view_rows + 1))
+
+        def cell_rect(cell):
+            return pygame.Rect(cell[0] * grid - offset_x, cell[1] * grid - offset_y, grid, grid)
+
+        board = pygame.Rect(0, 0, config.GAME_WIDTH, config.GAME_HEIGHT)
+        screen.fill(config.BLACK)
+        screen.set_clip(board)
+
+        # Grid lines of the visible cells only
+        for cx in range(area[0], area[2] + 1):
+            x = cx * grid - offset_x
+            pygame.draw.line(screen, config.GRAY, (x, 0), (x, config.GAME_HEIGHT))
+        for cy in range(area[1], area[3] + 1):
+            y = cy * grid - offset_y
+            pygame.draw.line(screen, config.GRAY, (0, y), (config.GAME_WIDTH, y))
+
+        if engine.food is not None:
+            pygame.draw.rect(screen, config.RED, cell_rect(engine.food))
+        power_up = engine.power_up
+        if power_up:
+            pygame.draw.rect(screen, power_up_color(config, power_up.type), cell_rect((power_up.x, power_up.y)))
+
+        for opponent in engine.opponents:
+            for i, segment in enumerate(opponent.snake):
+                if area[0] <= segment[0] < area[2] and area[1] <= segment[1] < area[3]:
+                    pygame.draw.rect(screen, config.ORANGE if i == 0 else config.DARK_ORANGE, cell_rect(segment))
+
+        # Body past the gradient from the chunk index, then the gradient section in order
+        # Boards shown through the camera always keep these as ChunkGrids
+        tail_color = segment_color(config, GRADIENT_LENGTH)
+        for cell in engine.body_chunks.cells_in(*area):
+            pygame.draw.rect(screen, tail_color, cell_rect(cell))
+
+        interpolate = config.INTERPOLATE and alpha < 1
+        if interpolate:
+            tail_rect = interpolated_tail_rect(config, engine, alpha)
+            if tail_rect:
+                pygame.draw.rect(screen, segment_color(config, len(engine.snake)), tail_rect.move(-offset_x, -offset_y))
+        for i, cell in enumerate(itertools.islice(engine.snake, GRADIENT_LENGTH)):
+            if not (i == 0 and interpolate):
+                pygame.draw.rect(screen, segment_color(config, i), cell_rect(cell))
+        if interpolate:
+            head_rect = interpolated_head_rect(config, engine, alpha)
+            pygame.draw.rect(screen, config.GREEN, head_rect.move(-offset_x, -offset_y))
+
+        for cell in engine.obstacles.cells_in(*area):
+            pygame.draw.rect(screen, config.PURPLE, cell_rect(cell))
+        screen.set_clip(None)
+
+        with game.phase("draw_side_panel"):
+            game.draw_side_panel()
+        self.draw_minimap(engine, (left, top))
+        game.present()
+
+    def bake_minimap(self, engine):
+        # Obstacles never move during a game, draw them into the minimap once
+        scale = MINIMAP_WIDTH / max(engine.cols, engine.rows)
+        size = (max(1, round(engine.cols * scale)), max(1, round(engine.rows * scale)))
+        surface = pygame.Surface(size)
+        surface.fill(self.config.BLACK)
+        # A minimap pixel can cover thousands of cells, shade it by how many are obstacles
+        counts = {}
+        for cell in engine.obstacles:
+            pixel = (int(cell[0] * scale), int(cell[1] * scale))
+            counts[pixel] = counts.get(pixel, 0) + 1
+        cells_per_pixel = max(1.0, 1 / (scale * scale))
+        side = max(1, int(scale))
+        for (px, py), count in counts.items():
+            shade = min(1.0, 0.3 + 10 * count / cells_per_pixel)
+            color = tuple(int(c * shade) for c in self.config.PURPLE)
+            surface.fill(color, (px, py, side, side))
+        self.minimap = surface
+        self.minimap_scale = scale
+        self.baked_obstacles = engine.obstacles
+
+    def draw_minimap(self, engine, camera):
+        if self.baked_obstacles is not engine.obstacles:
+            self.bake_minimap(engine)
+        config = self.config
+        screen = self.game.screen
+        scale = self.minimap_scale
+        x = config.GAME_WIDTH + 20
+        y = config.GAME_HEIGHT - 20 - self.minimap.get_height()
+        screen.blit(self.minimap, (x, y))
+
+        def dot(cell, color, size=3):
+            pygame.draw.rect(screen, color, (x + int(cell[0] * scale) - size // 2,
+                                             y + int(cell[1] * scale) - size // 2, size, size))
+
+        if engine.food is not None:
+            dot(engine.food, config.RED, 5)
+        for opponent in engine.opponents:
+            if opponent.alive:
+                dot(opponent.snake[0], config.ORANGE)
+        dot(engine.snake[0], config.GREEN, 5)
+
+        # Where the camera is looking
+        view = pygame.Rect(x + int(camera[0] * scale), y + int(camera[1] * scale),
+                           max(2, round(self.view_cols * scale)), max(2, round(self.view_rows * scale)))
+        pygame.draw.rect(screen, config.WHITE, view, 1)
+        pygame.draw.rect(screen, config.WHITE, (x, y, self.minimap.get_width(), self.minimap.get_height()), 1)
@@ -0,0 +1,199 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .snake_engine import Config, DIRECTIONS, derive_seed, fit_board, new_seed
+from .snake_env import SnakeEnv
+
+# Headless tournaments for Ular yang Mengular.
+#
+# Every agent plays the same M games, each started from the same seed for
+# every agent so they are compared on identical boards, across a pool of
+# worker processes. One JSON line per finished game is streamed to a file and
+# a summary per agent is printed at the end:
+#
+#     python -m ular_yang_mengular.tournament planner random --games 200
+#
+# An agent is a built-in name from AGENTS or "module:factory". A factory is
+# called with the SnakeEnv and a random.Random at the start of every game and
+# returns the policy, which maps an observation to an action (an index into
+# DIRECTIONS, or None to keep going straight). The env's engine is there for
+# scripted agents that want to look at the game state directly. The agent's
+# random.Random is a stream of its own, never the game's, so its choices
+# cannot line up with the spawns.
+
+def straight_agent(env, rng):
+    # Never turns, the baseline every other agent should beat
+    return lambda obs: None
+
+def random_agent(env, rng):
+    return lambda obs: rng.randrange(len(DIRECTIONS))
+
+def planner_agent(env, rng):
+    # The opponents' pathfinding steering the player's snake
+    from .snake_ai import Planner
+    engine = env.engine
+    planner = Planner(engine)
+    return lambda obs: DIRECTIONS.index(planner.choose(engine))
+
+AGENTS = {
+    "straight": straight_agent,
+    "random": random_agent,
+    "planner": planner_agent,
+}
+
+# Percentiles of score and survival ticks in the summary
+PERCENTILES = (50, 90, 99)
+
+def load_agent(spec):
+    if spec in AGENTS:
+        return AGENTS[spec]
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"unknown agent {spec!r}, use one of {', '.join(AGENTS)} or module:factory")
+    return getattr(importlib.import_module(module), name)
+
+def play_games(spec, config, difficulty, games, max_ticks):
+    # Runs in a worker process: plays every (game number, seed) in games and
+    # returns one result record per game
+    factory = load_agent(spec)
+    env = SnakeEnv(config, difficulty, max_steps=max_ticks)
+    results = []
+    for game, seed in games:
+        obs = env.reset(seed)
+        policy = factory(env, random.Random(derive_seed(seed, "agent")))
+        while True:
+            obs, _, done, info = env.step(policy(obs))
+            if done:
+                break
+        if info["truncated"]:
+            cause = "max_ticks"
+        elif info["won"]:
+            cause = None
+        else:
+            cause = info["death_cause"]
+        results.append({
+            "agent": spec,
+            "game": game,
+            "seed": seed,
+            "score": info["score"],
+            "ticks": info["ticks"],
+            "length": info["length"],
+            "won": info["won"],
+            "death_cause": cause,
+        })
+    return results
+
+def percentile(values, q):
+    # Nearest-rank percentile of a sorted list
+    return values[min(len(values) - 1, len(values) * q // 100)]
+
+def summarize(results):
+    # {agent: summary} over a list of game records
+    games = {}
+    for result in results:
+        games.setdefault(result["agent"], []).append(result)
+    summaries = {}
+    for agent, played in games.items():
+        scores = sorted(result["score"] for result in played)
+        ticks = sorted(result["ticks"] for result in played)
+        summaries[agent] = {
+            "games": len(played),
+            "mean_score": sum(scores) / len(scores),
+            "score_percentiles": {q: percentile(scores, q) for q in PERCENTILES},
+            "mean_ticks": sum(ticks) / len(ticks),
+            "tick_percentiles": {q: percentile(ticks, q) for q in PERCENTILES},
+            "wins": sum(result["won"] for result in played),
+            "death_causes": Counter(result["death_cause"] for result in played if result["death_cause"]),
+        }
+    return summaries
+
+def print_summary(summaries, out=sys.stdout):
+    for agent, summary in summaries.items():
+        scores = " ".join(f"p{q} {v}" for q, v in summary["score_percentiles"].items())
+        ticks = " ".join(f"p{q} {v}" for q, v in summary["tick_percentiles"].items())
+        causes = ", ".join(f"{cause} {count / summary['games']:.0%}"
+                           for cause, count in summary["death_causes"].most_common())
+        print(f"{agent}: {summary['games']} games, {summary['wins']} won", file=out)
+        print(f"  score  mean {summary['mean_score']:.2f}  {scores}", file=out)
+        print(f"  ticks  mean {summary['mean_ticks']:.1f}  {ticks}", file=out)
+        print(f"  deaths {causes or 'none'}", file=out)
+
+def run(agents, config, difficulty="Medium", games=100, seed=None, max_ticks=10000,
+        workers=None, output=None):
+    # Plays every agent's games across the pool, writing each batch of records
+    # to output as soon as it comes back, and returns every record
+    for spec in agents:
+        load_agent(spec)
+    # Game i always gets the same seed, however many games are played
+    root = new_seed() if seed is None else seed
+    seeds = [(game, derive_seed(root, game)) for game in range(games)]
+    workers = workers or os.cpu_count() or 1
+    # A few batches per worker and agent keeps the pool busy to the end
+    # without paying for a round trip per game
+    batch = max(1, -(-games // (workers * 4)))
+
+    results = []
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(play_games, spec, config, difficulty, seeds[i:i + batch], max_ticks)
+                   for spec in agents for i in range(0, games, batch)]
+        for future in as_completed(futures):
+            records = future.result()
+            results.extend(records)
+            if output:
+                for record in records:
+                    output.write(json.dumps(record) + "\n")
+                output.flush()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play agents against each other headlessly")
+    parser.add_argument("agents", nargs="+", metavar="AGENT",
+                        help=f"built-in agent ({', '.join(AGENTS)}) or module:factory")
+    parser.add_argument("--games", type=int, default=100, help="games per agent")
+    parser.add_argument("--seed", type=int, help="seed the games are drawn from, random if not given")
+    parser.add_argument("--difficulty", default="Medium", choices=["Easy", "Medium", "Hard"])
+    parser.add_argument("--board", metavar="COLSxROWS", help="board size in cells")
+    parser.add_argument("--obstacles", type=int, metavar="N", help="obstacles per game")
+    parser.add_argument("--power-up-chance", type=float, metavar="P", help="chance of a power-up when food is eaten")
+    parser.add_argument("--level", metavar="NAME", help="play a level from levels/ or a .lvl/.lvlc file")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="end a game that runs this long")
+    parser.add_argument("--workers", type=int, help="worker processes, one per CPU if not given")
+    parser.add_argument("--output", default="tournament.jsonl", help="file the per-game JSON lines go to")
+    args = parser.parse_args(argv)
+
+    if args.board and args.level:
+        # A level brings its own board size
+        parser.error("--board and --level cannot be used together")
+
+    config = Config()
+    if args.board:
+        cols, rows = (int(v) for v in args.board.lower().split("x"))
+        fit_board(config, cols, rows)
+    if args.level:
+        from .levels import load_level
+        level = load_level(args.level)
+        fit_board(config, level.cols, level.rows)
+        config.LEVEL = args.level
+        config.OBSTACLE_COUNT = level.obstacles
+    if args.obstacles is not None:
+        config.OBSTACLE_COUNT = args.obstacles
+    if args.power_up_chance is not None:
+        config.POWERUP_CHANCE = args.power_up_chance
+
+    start = time.perf_counter()
+    with open(args.output, "w") as output:
+        results = run(args.agents, config, args.difficulty, args.games, args.seed, args.max_ticks,
+                      args.workers, output)
+    elapsed = time.perf_counter() - start
+    print_summary(summarize(results))
+    print(f"{len(results)} games in {elapsed:.1f}s, results in {args.output}")
+
+if __name__ == "__main__":
+    main()